@@ -0,0 +1,60 @@
+"""query indexes
+
+Revision ID: a7c3e91f5d20
+Revises: 236203d0af2a
+Create Date: 2026-10-18 11:02:14.532190
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c3e91f5d20"
+down_revision: Union[str, Sequence[str], None] = "236203d0af2a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_attendance_tenant_employee_timestamp",
+        "attendance",
+        ["tenant_id", "employee_id", "timestamp"],
+        unique=False,
+        postgresql_include=["status"],
+    )
+    op.create_index(
+        "ix_attendance_tenant_timestamp",
+        "attendance",
+        ["tenant_id", "timestamp"],
+        unique=False,
+        postgresql_include=["employee_id", "status"],
+    )
+    # (employee_id, token_type) lookups are served by uq_employee_tokens
+    op.create_index(
+        "ix_token_tenant_type",
+        "token",
+        ["tenant_id", "token_type", "employee_id"],
+        unique=False,
+    )
+    op.create_index("ix_token_token_hash", "token", ["token_hash"], unique=False)
+    op.create_index(
+        "ix_geomarking_tenant_id", "geomarking", ["tenant_id"], unique=False
+    )
+    op.create_index("ix_employee_tenant_id", "employee", ["tenant_id"], unique=False)
+    op.create_index("ix_user_email", "user", ["email"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_user_email", table_name="user")
+    op.drop_index("ix_employee_tenant_id", table_name="employee")
+    op.drop_index("ix_geomarking_tenant_id", table_name="geomarking")
+    op.drop_index("ix_token_token_hash", table_name="token")
+    op.drop_index("ix_token_tenant_type", table_name="token")
+    op.drop_index("ix_attendance_tenant_timestamp", table_name="attendance")
+    op.drop_index("ix_attendance_tenant_employee_timestamp", table_name="attendance")
@@ -0,0 +1,66 @@
+"""attendance daily
+
+Revision ID: c41d7b2e9f83
+Revises: a7c3e91f5d20
+Create Date: 2026-10-18 12:10:41.208113
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c41d7b2e9f83"
+down_revision: Union[str, Sequence[str], None] = "a7c3e91f5d20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "attendance_daily",
+        sa.Column("tenant_id", sa.Uuid(), nullable=False),
+        sa.Column("employee_id", sa.Uuid(), nullable=False),
+        sa.Column("local_date", sa.Date(), nullable=False),
+        sa.Column("first_in_time", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "first_in_location", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+        sa.Column("first_in_distance", sa.Float(), nullable=True),
+        sa.Column("last_out_time", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "last_out_location", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+        sa.Column("last_out_distance", sa.Float(), nullable=True),
+        sa.Column(
+            "last_status", sqlmodel.sql.sqltypes.AutoString(length=5), nullable=False
+        ),
+        sa.Column("total_in_count", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["employee_id"],
+            ["employee.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["tenant_id"],
+            ["tenant.id"],
+        ),
+        sa.PrimaryKeyConstraint("tenant_id", "employee_id", "local_date"),
+    )
+    op.create_index(
+        "ix_attendance_daily_tenant_date",
+        "attendance_daily",
+        ["tenant_id", "local_date"],
+        unique=False,
+    )
+    # existing data is summarised by: python -m api.commands.backfill_daily
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_attendance_daily_tenant_date", table_name="attendance_daily")
+    op.drop_table("attendance_daily")
@@ -0,0 +1,63 @@
+"""token digest
+
+Revision ID: e2b9d4a6c1f7
+Revises: c41d7b2e9f83
+Create Date: 2026-10-18 14:21:37.604118
+
+"""
+
+import hashlib
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e2b9d4a6c1f7"
+down_revision: Union[str, Sequence[str], None] = "c41d7b2e9f83"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # replace the stored jwts with their sha256 hex digest
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            "UPDATE token SET token_hash = "
+            "encode(sha256(convert_to(token_hash, 'UTF8')), 'hex')"
+        )
+    else:
+        token = sa.table("token", sa.column("id"), sa.column("token_hash"))
+        for id, jwt in bind.execute(sa.select(token.c.id, token.c.token_hash)):
+            op.execute(
+                token.update()
+                .where(token.c.id == id)
+                .values(token_hash=hashlib.sha256(jwt.encode()).hexdigest())
+            )
+
+    op.drop_index("ix_token_token_hash", table_name="token")
+    with op.batch_alter_table("token") as batch_op:
+        batch_op.alter_column(
+            "token_hash",
+            existing_type=sqlmodel.sql.sqltypes.AutoString(),
+            type_=sqlmodel.sql.sqltypes.AutoString(length=64),
+            existing_nullable=False,
+        )
+    op.create_index("ix_token_token_hash", "token", ["token_hash"], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # digests can not be turned back into jwts, employees sign in again
+    op.drop_index("ix_token_token_hash", table_name="token")
+    with op.batch_alter_table("token") as batch_op:
+        batch_op.alter_column(
+            "token_hash",
+            existing_type=sqlmodel.sql.sqltypes.AutoString(length=64),
+            type_=sqlmodel.sql.sqltypes.AutoString(),
+            existing_nullable=False,
+        )
+    op.create_index("ix_token_token_hash", "token", ["token_hash"], unique=False)
@@ -0,0 +1,39 @@
+"""
+Build attendance_daily from the existing attendance rows
+
+    python -m api.commands.backfill_daily
+    python -m api.commands.backfill_daily --tenant <id> --start 2025-08-01
+
+Days inside the selected range are recomputed and replaced, so it is safe to
+run again after a partial run or to repair a tenant.
+"""
+
+import argparse
+import asyncio
+import uuid
+from datetime import date
+
+from api.sa.db import async_session
+from api.services.cruds.tenant import attendance_daily_repo
+
+
+async def backfill(tenant_id=None, start_date=None, end_date=None):
+    async with async_session() as db:
+        return await attendance_daily_repo.rebuild(
+            db, tenant_id=tenant_id, start_date=start_date, end_date=end_date
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tenant", type=uuid.UUID, help="only this tenant")
+    parser.add_argument("--start", type=date.fromisoformat, help="first local day")
+    parser.add_argument("--end", type=date.fromisoformat, help="last local day")
+    args = parser.parse_args()
+
+    written = asyncio.run(backfill(args.tenant, args.start, args.end))
+    print(f"attendance_daily: {written} rows written")
+
+
+if __name__ == "__main__":
+    main()
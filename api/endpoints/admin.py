@@ -1,17 +1,48 @@
+import csv
+import io
 import logging
 import uuid
 from datetime import date, datetime
+from typing import Any, List, Literal, Optional
+
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
-
-from api.models import EmployeeCreateSchema, GeoMarkingCreateschema
+from api.models import (
+    EmployeeCreateSchema,
+    EmployeeRead,
+    GeoMarkingCreateschema,
+    GeoMarkingRead,
+)
 from api.services.employee_service import employee_service
 
-from ..sa.auth import create_admin_access_token, verify_password
+from ..sa.auth import (
+    PasswordQueueFull,
+    create_admin_access_token,
+    password_service,
+)
 from ..sa.db import AsyncSession, get_session
-from ..sa.depend import get_admin
+from ..sa.depend import (
+    PageQuery,
+    get_admin,
+    get_page_query,
+    page_items,
+    set_next_cursor,
+)
 from ..sa.settings import settings
 from ..schema.general import LoginPost
+from ..schema.response import EmployeeStatus, UserRead
 from ..services.cruds.tenant import (
     Employee,
     EmployeeCreate,
@@ -24,6 +55,7 @@ from ..services.cruds.tenant import (
     geomarking_repo,
     user_repo,
 )
+from ..utlis import export
 
 logger = logging.getLogger()
 router = APIRouter(tags=["Admin"])
@@ -38,14 +70,24 @@ async def admin_login(
 ):
     try:
         admin: User = await user_repo.get_user_by_email(db, credential.username)
-        if (
-            not admin
-            or not admin.is_active
-            or not verify_password(credential.password, admin.password_hash)
-        ):
+        if not admin or not admin.is_active:
+            raise HTTPException(
+                status_code=400, detail="Invalid credentials or inactive"
+            )
+        valid, new_hash = await password_service.verify_and_update(
+            credential.password, admin.password_hash
+        )
+        if not valid:
             raise HTTPException(
                 status_code=400, detail="Invalid credentials or inactive"
             )
+        if new_hash:
+            await user_repo.update_password_hash(db, admin.id, new_hash)
+    except PasswordQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="too many login attempts, try again",
+        )
     except Exception as e:
         logger.debug(str(e))
         raise HTTPException(status_code=400, detail="invalid credentials")
@@ -71,7 +113,7 @@ def logout(response: Response):
     return {"message": "Logged out"}
 
 
-@router.get("/admin/me")
+@router.get("/admin/me", response_model=UserRead)
 async def get_me(admin=Depends(get_admin)):
     return admin
 
@@ -90,6 +132,43 @@ async def create_tenant_employee(
     return await employee_repo.create(db, employee_create)
 
 
+@router.post("/admin/tenant/employees/import")
+async def import_tenant_employees(
+    employees: List[Any] = Body(
+        max_length=settings.employee_import_max_rows,
+        description="EmployeeCreateSchema objects",
+    ),
+    admin: User = Depends(get_admin),
+    db: AsyncSession = Depends(get_session),
+):
+    return await employee_service.import_employees(admin.tenant_id, employees, db)
+
+
+@router.post("/admin/tenant/employees/import/csv")
+async def import_tenant_employees_csv(
+    file: UploadFile = File(
+        description="csv with header employee_no,name[,email,phone,is_active]"
+    ),
+    admin: User = Depends(get_admin),
+    db: AsyncSession = Depends(get_session),
+):
+    try:
+        text = (await file.read()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="csv must be utf-8")
+    # empty cells are missing values, not empty strings
+    rows = [
+        {k: v for k, v in row.items() if k and v not in (None, "")}
+        for row in csv.DictReader(io.StringIO(text))
+    ]
+    if len(rows) > settings.employee_import_max_rows:
+        raise HTTPException(
+            status_code=413,
+            detail=f"at most {settings.employee_import_max_rows} rows per import",
+        )
+    return await employee_service.import_employees(admin.tenant_id, rows, db)
+
+
 @router.get("/admin/tenant/employee/{id}")
 async def get_tenant_employee(
     id: uuid.UUID,
@@ -117,18 +196,34 @@ async def activate_tenant_employee(
     return await employee_repo.activate(db, admin.tenant_id, id)
 
 
-@router.get("/admin/tenant/employees")
+@router.get("/admin/tenant/employees", response_model=List[EmployeeRead])
 async def get_tenant_employees(
-    admin: User = Depends(get_admin), db: AsyncSession = Depends(get_session)
+    response: Response,
+    page: PageQuery = Depends(get_page_query),
+    admin: User = Depends(get_admin),
+    db: AsyncSession = Depends(get_session),
 ):
-    return await employee_repo.get_all(db, admin.tenant_id)
+    return page_items(
+        response,
+        await employee_repo.get_page(db, admin.tenant_id, page.cursor, page.limit),
+        EmployeeRead,
+    )
 
 
-@router.get("/admin/tenant/employees/status")
+@router.get("/admin/tenant/employees/status", response_model=List[EmployeeStatus])
 async def get_tenant_employees_status(
-    admin: User = Depends(get_admin), db: AsyncSession = Depends(get_session)
+    response: Response,
+    page: PageQuery = Depends(get_page_query),
+    admin: User = Depends(get_admin),
+    db: AsyncSession = Depends(get_session),
 ):
-    return await employee_repo.get_employee_status(db, admin.tenant_id)
+    return page_items(
+        response,
+        await employee_repo.get_employee_status(
+            db, admin.tenant_id, page.cursor, page.limit
+        ),
+        EmployeeStatus,
+    )
 
 
 @router.post("/admin/tenant/employees/{id}/idtoken")
@@ -177,6 +272,55 @@ async def get_employee_attendance(
     return data
 
 
+@router.get("/admin/tenant/attendance/report")
+async def get_tenant_attendance_report(
+    response: Response,
+    start_date: date = Query(description="yyyy-mm-dd formate"),
+    end_date: date = Query(description="yyyy-mm-dd formate"),
+    page: PageQuery = Depends(get_page_query),
+    admin: User = Depends(get_admin),
+    db: AsyncSession = Depends(get_session),
+):
+    """
+    Day summaries of a page of employees (limit counts employees), columnar:
+    employees.{id,employee_no,name}[i] and days.<column>[j], where
+    days.employee[j] is the index i of the employee of day j.
+    """
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date is before start_date")
+    report, next_cursor = await employee_service.get_tenant_report(
+        admin.tenant_id, start_date, end_date, db, page.cursor, page.limit
+    )
+    set_next_cursor(response, next_cursor)
+    return report
+
+
+@router.get("/admin/tenant/attendance/export")
+async def export_attendance(
+    start_date: date = Query(description="yyyy-mm-dd formate"),
+    end_date: date = Query(description="yyyy-mm-dd formate"),
+    employee_id: Optional[uuid.UUID] = Query(None, description="all when missing"),
+    format: Literal["csv", "ndjson"] = "csv",
+    admin: User = Depends(get_admin),
+):
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date is before start_date")
+    columns, partitions = employee_service.attendance_export(
+        admin.tenant_id, start_date, end_date, employee_id
+    )
+    if format == "csv":
+        body, media_type = export.csv_stream(columns, partitions), "text/csv"
+    else:
+        body = export.ndjson_stream(columns, partitions)
+        media_type = "application/x-ndjson"
+    filename = f"attendance_{start_date}_{end_date}.{format}"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 # Geomarking service
 @router.post("/admin/tenant/geomarking")
 async def create_tenant_geomarking(
@@ -199,11 +343,20 @@ async def get_tenant_geomarking(
     return await geomarking_repo.get(db, admin.tenant_id, id)
 
 
-@router.get("/admin/tenant/geomarking")
+@router.get("/admin/tenant/geomarking", response_model=List[GeoMarkingRead])
 async def get_tenant_geomarkings(
-    admin: User = Depends(get_admin), db: AsyncSession = Depends(get_session)
+    response: Response,
+    page: PageQuery = Depends(get_page_query),
+    admin: User = Depends(get_admin),
+    db: AsyncSession = Depends(get_session),
 ):
-    return await geomarking_repo.get_all_by_tenant(db, admin.tenant_id)
+    return page_items(
+        response,
+        await geomarking_repo.get_page_by_tenant(
+            db, admin.tenant_id, page.cursor, page.limit
+        ),
+        GeoMarkingRead,
+    )
 
 
 @router.put("/admin/tenant/geomarking/{id}")
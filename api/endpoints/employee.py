@@ -1,6 +1,5 @@
 import logging
-import zoneinfo
-from datetime import datetime
+from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.exc import IntegrityError
@@ -13,6 +12,9 @@ from api.sa.utils import device_hash, is_mobile
 from api.services.employee_service import employee_service
 
 from ..schema.general import Coordinate
+from ..schema.response import AttendanceCardDay, EmployeeState, MarkResponse
+from ..utlis.dates import local_today
+from ..utlis.response import ModelResponse
 
 router = APIRouter(tags=["Employee"])
 logger = logging.getLogger()
@@ -66,14 +68,15 @@ async def employee_login(
         raise HTTPException(status_code=400, detail="token login got error")
 
 
-@router.get("/employee/me")
+@router.get("/employee/me", response_model=EmployeeState)
 async def get_me(
+    response: Response,
     employee: Employee = Depends(get_employee),
     db: AsyncSession = Depends(get_session),
 ):
     states = await employee_service.get_state(employee.tenant_id, employee.id, db)
 
-    return {**employee.model_dump(), **states}
+    return ModelResponse(EmployeeState, {**dict(employee), **states}, response)
 
 
 @router.get("/employee/mytenant")
@@ -87,8 +90,9 @@ async def get_my_tenant(
     return await employee_service.get_tenant(employee.tenant_id, db)
 
 
-@router.post("/employee/markin")
+@router.post("/employee/markin", response_model=MarkResponse)
 async def mark_in(
+    response: Response,
     coordinates: Coordinate,
     employee: Employee = Depends(get_employee),
     db: AsyncSession = Depends(get_session),
@@ -100,13 +104,14 @@ async def mark_in(
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="invalid option"
         )
-    response = attenadance.model_dump()
-    response.update({"place": near_geo_mark.name})
-    return response
+    return ModelResponse(
+        MarkResponse, {**dict(attenadance), "place": near_geo_mark.name}, response
+    )
 
 
-@router.post("/employee/markout")
+@router.post("/employee/markout", response_model=MarkResponse)
 async def mark_out(
+    response: Response,
     coordinates: Coordinate,
     employee: Employee = Depends(get_employee),
     db: AsyncSession = Depends(get_session),
@@ -120,20 +125,20 @@ async def mark_out(
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="invalid option"
         )
-    response = attenadance.model_dump()
-    response.update({"place": near_geo_mark.name})
-    return response
+    return ModelResponse(
+        MarkResponse, {**dict(attenadance), "place": near_geo_mark.name}, response
+    )
 
 
-@router.get("/employee/attendance_card")
+@router.get("/employee/attendance_card", response_model=List[AttendanceCardDay])
 async def attendance_card(
+    response: Response,
     employee: Employee = Depends(get_employee),
     db: AsyncSession = Depends(get_session),
 ):
 
-    client_tz = zoneinfo.ZoneInfo(settings.timezone)
-    start_of_start_date = datetime.now(tz=client_tz).date().replace(day=1)
-    end_of_end_date = datetime.now(tz=client_tz).date()
+    end_of_end_date = local_today()
+    start_of_start_date = end_of_end_date.replace(day=1)
 
     attenadance = await employee_service.get_attendance_card(
         employee.tenant_id,
@@ -142,7 +147,7 @@ async def attendance_card(
         end_of_end_date,
         db,
     )
-    return attenadance
+    return ModelResponse(List[AttendanceCardDay], attenadance, response)
 
 
 @router.get("/employee/nears")
@@ -1,20 +1,33 @@
 import uuid
+from typing import List
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Request, Response
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models import UserCreateSchema
+from ..sa import metrics, slow_queries
 from ..sa.auth import (
     Levels,
+    PasswordQueueFull,
     create_agent_hash,
     create_owner_access_token,
-    get_password_hash,
+    password_service,
 )
-from ..sa.db import get_session
+from ..sa.db import get_session, pool_metrics
+from ..sa.depend import PageQuery, get_page_query, page_items
 from ..sa.settings import settings
 from ..schema.general import LoginPost
-from ..services.cruds.tenant import TenantCreate, UserCreate, tenant_repo, user_repo
+from ..schema.response import UserRead
+from ..services.attendance_writer import attendance_writer
+from ..services.cruds.tenant import (
+    Tenant,
+    TenantCreate,
+    UserCreate,
+    tenant_repo,
+    user_repo,
+)
+from ..utlis import cache
 
 router_no_auth = APIRouter(tags=["Owner"])
 
@@ -117,9 +130,15 @@ async def activate_tenant(id: uuid.UUID, db: AsyncSession = Depends(get_session)
     return await tenant_repo.activate(db, id)
 
 
-@router.get("/owner/tenants")
-async def get_tenants(db: AsyncSession = Depends(get_session)):
-    return await tenant_repo.get_all(db)
+@router.get("/owner/tenants", response_model=List[Tenant])
+async def get_tenants(
+    response: Response,
+    page: PageQuery = Depends(get_page_query),
+    db: AsyncSession = Depends(get_session),
+):
+    return page_items(
+        response, await tenant_repo.get_page(db, page.cursor, page.limit), Tenant
+    )
 
 
 # user apis
@@ -127,7 +146,10 @@ async def get_tenants(db: AsyncSession = Depends(get_session)):
 async def create_tenant_user(
     tenant_user: UserCreateSchema, db: AsyncSession = Depends(get_session)
 ):
-    hashed_pw = get_password_hash(tenant_user.password)
+    try:
+        hashed_pw = await password_service.hash(tenant_user.password)
+    except PasswordQueueFull:
+        raise HTTPException(status_code=503, detail="server busy, try again")
     # Create the real user create model
     user_data = UserCreate(
         tenant_id=tenant_user.tenant_id,
@@ -161,6 +183,47 @@ async def activate_tenant_user(
     return await user_repo.activate(db, id)
 
 
-@router.get("/owner/tenant/{tenant_id}/users")
-async def get_tenant_users(db: AsyncSession = Depends(get_session)):
-    return await user_repo.get_all(db)
+@router.get("/owner/tenant/{tenant_id}/users", response_model=List[UserRead])
+async def get_tenant_users(
+    tenant_id: uuid.UUID,
+    response: Response,
+    page: PageQuery = Depends(get_page_query),
+    db: AsyncSession = Depends(get_session),
+):
+    return page_items(
+        response,
+        await user_repo.get_page_by_tenant(db, tenant_id, page.cursor, page.limit),
+        UserRead,
+    )
+
+
+@router.get("/owner/stats/cache")
+async def get_cache_stats():
+    """hit/miss counters of the in-process caches of this worker"""
+    return cache.stats()
+
+
+@router.get("/owner/stats/db")
+async def get_db_stats():
+    """connection pool usage of this worker"""
+    return pool_metrics.snapshot()
+
+
+@router.get("/owner/stats/attendance_writer")
+async def get_attendance_writer_stats():
+    """batches written by the attendance group commit writer of this worker"""
+    return attendance_writer.stats()
+
+
+@router.get("/owner/stats/slow_queries")
+async def get_slow_queries():
+    """statements slower than slow_query_ms with their plan, newest first"""
+    return slow_queries.recent()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """per route latency, status and SQL counters of this worker (Prometheus)"""
+    return PlainTextResponse(
+        metrics.prometheus(), media_type="text/plain; version=0.0.4"
+    )
@@ -1,23 +1,41 @@
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from api.sa.settings import settings
 
 from .endpoints import admin, employee, owner
 from .sa.auth import validate_owner
+from .sa.metrics import MetricsMiddleware
+from .services.attendance_writer import attendance_writer
 
 logger = logging.getLogger("sa")
 logging.basicConfig(level=logging.DEBUG)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.attendance_group_commit:
+        await attendance_writer.start()
+    yield
+    # queued marks are written before the worker exits
+    await attendance_writer.stop()
+
+
 if settings.production:
     logger.info("App is runnnig on production..")
     app = FastAPI(
-        title="SimpleAttendance", docs_url=None, redoc_url=None, openapi_url=None
+        title="SimpleAttendance",
+        docs_url=None,
+        redoc_url=None,
+        openapi_url=None,
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
     )
 
     @app.get("/docs", include_in_schema=False)
@@ -42,6 +60,8 @@ if not settings.production:
     logging.info("App is runnnig on development..")
     app = FastAPI(
         title="SimpleAttendance",
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
     )
 
 app.include_router(admin.router, prefix="/api")
@@ -60,4 +80,6 @@ app.add_middleware(
     allow_methods=settings.allow_methods.split(","),
     allow_headers=settings.allow_headers.split(","),
     allow_credentials=True,
+    expose_headers=["X-Next-Cursor"],
 )
+app.add_middleware(MetricsMiddleware)
@@ -1,10 +1,11 @@
 # models.py
 import uuid
-from datetime import datetime, timezone
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
 from typing import Annotated, Optional
 
 from pydantic import BeforeValidator
-from sqlmodel import Column, DateTime, Field, SQLModel
+from sqlmodel import Column, DateTime, Field, Index, SQLModel
 
 from .token import Token
 
@@ -48,7 +49,7 @@ class Tenant(TenantBase, table=True):
 
 class UserBase(SQLModel):
     tenant_id: uuid.UUID = Field(foreign_key="tenant.id")
-    email: str
+    email: str = Field(index=True)
     password_hash: str
     role: str = "admin"
     is_active: bool = True
@@ -82,8 +83,8 @@ class User(UserBase, table=True):
 
 
 class EmployeeBase(SQLModel):
-    employee_no: str
-    tenant_id: uuid.UUID = Field(foreign_key="tenant.id")
+    employee_no: str = Field(unique=True)
+    tenant_id: uuid.UUID = Field(foreign_key="tenant.id", index=True)
     name: str
     email: Optional[str] = None
     phone: Optional[str] = None
@@ -147,6 +148,51 @@ class AttendanceRead(AttendanceBase):
 # Actual DB model
 class Attendance(AttendanceBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    __table_args__ = (
+        # employee day/range lookups (mark in/out, state, reports)
+        Index(
+            "ix_attendance_tenant_employee_timestamp",
+            "tenant_id",
+            "employee_id",
+            "timestamp",
+            postgresql_include=["status"],
+        ),
+        # tenant wide day lookups (employee status)
+        Index(
+            "ix_attendance_tenant_timestamp",
+            "tenant_id",
+            "timestamp",
+            postgresql_include=["employee_id", "status"],
+        ),
+    )
+
+
+# Per employee and local calendar day summary, maintained on mark in/out
+class AttendanceDaily(SQLModel, table=True):
+    __tablename__ = "attendance_daily"
+
+    tenant_id: uuid.UUID = Field(foreign_key="tenant.id", primary_key=True)
+    employee_id: uuid.UUID = Field(foreign_key="employee.id", primary_key=True)
+    local_date: date = Field(primary_key=True)
+    first_in_time: Optional[UTCDatetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    first_in_location: Optional[str] = None
+    first_in_distance: Optional[float] = None
+    last_out_time: Optional[UTCDatetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    last_out_location: Optional[str] = None
+    last_out_distance: Optional[float] = None
+    last_status: str = Field(max_length=5)
+    total_in_count: int = 0
+    updated_at: UTCDatetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+    __table_args__ = (
+        # tenant wide day reports
+        Index("ix_attendance_daily_tenant_date", "tenant_id", "local_date"),
+    )
 
 
 # ✅ Shared Base (for Create/Update)
@@ -189,5 +235,30 @@ class GeoMarkingUpdate(GeoMarkingBase):
 #  Main DB model
 class GeoMarking(GeoMarkingBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    tenant_id: uuid.UUID = Field(foreign_key="tenant.id")
+    tenant_id: uuid.UUID = Field(foreign_key="tenant.id", index=True)
     created_at: datetime = Field(default_factory=datetime.now)
+
+
+@dataclass(slots=True, frozen=True)
+class GeoMarkingSnapshot:
+    """Immutable copy of a GeoMarking row, safe to share between sessions"""
+
+    name: str
+    latitude: float
+    longitude: float
+    radius_meters: float
+    id: uuid.UUID
+    tenant_id: uuid.UUID
+    created_at: datetime
+
+    @classmethod
+    def from_model(cls, obj: GeoMarking) -> "GeoMarkingSnapshot":
+        return cls(
+            name=obj.name,
+            latitude=obj.latitude,
+            longitude=obj.longitude,
+            radius_meters=obj.radius_meters,
+            id=obj.id,
+            tenant_id=obj.tenant_id,
+            created_at=obj.created_at,
+        )
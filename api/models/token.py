@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlmodel import Field, SQLModel, UniqueConstraint
+from sqlmodel import Field, Index, SQLModel, UniqueConstraint
 
 
 # --- Table Model ---
@@ -11,14 +11,17 @@ class Token(SQLModel, table=True):
     tenant_id: uuid.UUID = Field(foreign_key="tenant.id")
     employee_id: uuid.UUID = Field(foreign_key="employee.id")
     token_type: str = "access_token_employee"
-    token_hash: str
+    # sha256 hex digest of the jwt, the jwt itself is only sent to the client
+    token_hash: str = Field(max_length=64, unique=True, index=True)
     device_hash: str
     expires_at: datetime
     used_at: Optional[datetime] = None
     ip_address: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.now)
     __table_args__ = (
+        # also serves the (tenant_id, employee_id, token_type) lookups
         UniqueConstraint("employee_id", "token_type", name="uq_employee_tokens"),
+        Index("ix_token_tenant_type", "tenant_id", "token_type", "employee_id"),
     )
 
 
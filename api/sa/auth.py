@@ -1,9 +1,12 @@
+import asyncio
 import base64
 import hashlib
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from enum import Enum
+from typing import Tuple
 
 from fastapi import Cookie, HTTPException, Request, status
 from jose import jwt
@@ -11,7 +14,7 @@ from passlib.hash import pbkdf2_sha256
 
 from ..utlis.sa import ip_from_request
 from .settings import settings
-from .utils import create_token
+from .utils import create_token, decode_token
 
 logger = logging.getLogger()
 
@@ -35,14 +38,79 @@ def create_agent_hash(request: Request):
     }
 
 
+PASSWORD_HASHER = (
+    pbkdf2_sha256.using(rounds=settings.password_hash_rounds)
+    if settings.password_hash_rounds
+    else pbkdf2_sha256
+)
+
+
 def verify_password(plain, hashed):
     "verify the plain password with hashed password"
-    return pbkdf2_sha256.verify(plain, hashed)
+    return PASSWORD_HASHER.verify(plain, hashed)
 
 
 def get_password_hash(password):
     "Create a has using Cryptocontext"
-    return pbkdf2_sha256.hash(password)
+    return PASSWORD_HASHER.hash(password)
+
+
+class PasswordQueueFull(Exception):
+    "Raised when too many password hashes are already running or waiting"
+
+
+class PasswordService:
+    """
+    Async wrapper running pbkdf2 on a bounded thread pool, so a login does not
+    block the event loop (hashlib releases the GIL while hashing).
+    """
+
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.pending = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+    async def _run(self, fn, *args):
+        if self.pending >= self.workers + self.queue_limit:
+            raise PasswordQueueFull()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password"
+            )
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, fn, *args
+            )
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain: str, hashed: str) -> bool:
+        return await self._run(verify_password, plain, hashed)
+
+    async def verify_and_update(self, plain: str, hashed: str) -> Tuple[bool, str]:
+        """
+        verify the password, and when the stored hash does not use the
+        configured rounds return a new hash to store (else None)
+        """
+        valid = await self.verify(plain, hashed)
+        if valid and PASSWORD_HASHER.needs_update(hashed):
+            return True, await self.hash(plain)
+        return valid, None
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_service = PasswordService(
+    settings.password_hash_workers, settings.password_hash_queue_limit
+)
 
 
 def create_owner_access_token(data: dict, expire_second: int = None):
@@ -79,6 +147,15 @@ def create_employee_access_token(data: dict, expires_delta: timedelta = None):
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def admin_claims(payload: dict) -> dict:
+    "claims of an admin token, every value is base64 encoded"
+    return {
+        k: base64.b64decode(v[:-1].encode("utf-8")).decode("utf-8")
+        for k, v in payload.items()
+        if k != "exp"
+    }
+
+
 async def validate_owner(request: Request, access_token: str = Cookie(None)):
     """
     validate owner access token and UA
@@ -92,7 +169,7 @@ async def validate_owner(request: Request, access_token: str = Cookie(None)):
         )
     try:
 
-        token = jwt.decode(access_token, SECRET_KEY, algorithms=ALGORITHM)
+        token = decode_token(access_token)
     except Exception as e:
         logger.debug(str(e))
         raise HTTPException(
@@ -132,12 +209,7 @@ async def validate_admin(request: Request, access_token_admin: str = Cookie(None
             detail="Not authenticated (cookie missing)",
         )
     try:
-        token = jwt.decode(access_token_admin, SECRET_KEY, algorithms=ALGORITHM)
-        token = {
-            k: base64.b64decode(v[:-1].encode("utf-8")).decode("utf-8")
-            for k, v in token.items()
-            if k != "exp"
-        }
+        token = decode_token(access_token_admin, admin_claims)
     except Exception as e:
         logger.debug(str(e))
         raise HTTPException(
@@ -179,7 +251,7 @@ async def validate_employee(request: Request, access_token: str = Cookie(None)):
             detail="Not authenticated (cookie missing)",
         )
 
-    token = jwt.decode(access_token, SECRET_KEY, algorithms=ALGORITHM)
+    token = decode_token(access_token)
 
     if not ("level_" in token and token["level_"] == Levels.EMPLOYEE.value):
         raise HTTPException(
@@ -1,17 +1,131 @@
+import time
+import uuid
+from dataclasses import asdict, dataclass
 from typing import AsyncGenerator
 
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from . import slow_queries
+from .metrics import record_statement
 from .settings import settings
 
 DATABASE_URL = settings.db_url
 
-engine = create_async_engine(DATABASE_URL, echo=False)
+
+@dataclass(slots=True)
+class PoolMetrics:
+    """connection pool counters of this worker"""
+
+    checked_out: int = 0
+    checkouts: int = 0
+    overflow_checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    def snapshot(self) -> dict:
+        data = asdict(self)
+        pool = engine.sync_engine.pool
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            data.update(
+                pool_size=pool.size(),
+                max_overflow=settings.db_max_overflow,
+                overflow=pool.overflow(),
+                idle=pool.checkedin(),
+            )
+        return data
+
+
+pool_metrics = PoolMetrics()
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """queue pool recording how long a checkout waits for a connection"""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            pool_metrics.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            pool_metrics.wait_seconds_total += waited
+            if waited > pool_metrics.wait_seconds_max:
+                pool_metrics.wait_seconds_max = waited
+
+
+def engine_options(url: str) -> dict:
+    """create_async_engine arguments from settings"""
+    url = make_url(url)
+    options = {
+        "echo": False,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # in memory sqlite lives in a single static connection
+        return options
+
+    options.update(
+        poolclass=MeteredQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+    )
+    if url.get_driver_name() == "asyncpg":
+        if settings.db_prepared_statements:
+            cache_size = settings.db_statement_cache_size
+            options["connect_args"] = {"prepared_statement_cache_size": cache_size}
+        else:
+            # pgbouncer in transaction mode, no named statements survive
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+            }
+    return options
+
+
+engine = create_async_engine(DATABASE_URL, **engine_options(DATABASE_URL))
 async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
+@event.listens_for(engine.sync_engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    pool_metrics.checked_out += 1
+    pool_metrics.checkouts += 1
+    pool = engine.sync_engine.pool
+    if isinstance(pool, AsyncAdaptedQueuePool) and pool.overflow() > 0:
+        pool_metrics.overflow_checkouts += 1
+
+
+@event.listens_for(engine.sync_engine, "checkin")
+def _on_checkin(dbapi_connection, connection_record):
+    if pool_metrics.checked_out > 0:
+        pool_metrics.checked_out -= 1
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    context._started_at = time.perf_counter()
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    seconds = time.perf_counter() - context._started_at
+    record_statement(seconds)
+    if settings.slow_query_ms and seconds * 1000 >= settings.slow_query_ms:
+        slow_queries.observe(engine, statement, parameters, seconds, many)
+
+
 #  Use this function as FastAPI dependency
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
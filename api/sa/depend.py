@@ -1,12 +1,16 @@
 import logging
 import uuid
+from dataclasses import dataclass
+from typing import Any, List, Optional
 
-from fastapi import Cookie, Depends, HTTPException, Request, Response, status
+from fastapi import Cookie, Depends, HTTPException, Query, Request, Response, status
 
 from api.sa.settings import settings
 from api.services.employee_service import employee_service
 
-from ..services.cruds.tenant import user_repo
+from ..services.cruds.base import InvalidCursor, Page, decode_cursor
+from ..services.cruds.tenant import User, admin_cache, user_repo
+from ..utlis.response import ModelResponse
 from .auth import validate_admin
 from .db import AsyncSession, get_session
 from .utils import device_hash, is_mobile
@@ -24,7 +28,13 @@ async def get_admin(
     """
     try:
 
-        admin = await user_repo.get(db, id=uuid.UUID(token.get("id")))
+        user_id = uuid.UUID(token.get("id"))
+        admin = admin_cache.get(user_id)
+        if admin is None:
+            admin = await user_repo.get(db, id=user_id)
+            if admin and admin.is_active:
+                # cache a copy, the instance stays bound to this request session
+                admin = admin_cache.set(user_id, User.model_validate(admin))
 
         if (
             not admin
@@ -72,30 +82,25 @@ async def get_employee(
             )
         device = device_hash(request)
 
-        token, new_session = await employee_service.validate_employee_session(
+        session = await employee_service.get_employee_session(
             db, act_employee, rft_employee, device
         )
-        if token is None:
+        if session is None:
             logger.error("session validation error")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid session"
             )
-
-        # get employee details
-
-        employee = await employee_service.employee_repo.get(
-            db, token.tenant_id, token.employee_id
-        )
+        token, employee, new_access = session
 
         if not employee or not employee.is_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="account is deactive or missing",
             )
-        if new_session:
+        if new_access:
             response.set_cookie(
                 "act_employee",
-                token.token_hash,
+                new_access,
                 httponly=True,
                 max_age=settings.employee_access_token_expiry_minute * 60,
                 path=settings.COOKIE_PATH,
@@ -111,3 +116,38 @@ async def get_employee(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated (some auth issue))",
         )
+
+
+@dataclass(slots=True, frozen=True)
+class PageQuery:
+    cursor: Optional[str]
+    limit: Optional[int]
+
+
+def get_page_query(
+    cursor: Optional[str] = Query(
+        None, description="X-Next-Cursor header of the previous page"
+    ),
+    limit: Optional[int] = Query(None, ge=1, le=settings.page_size_max),
+) -> PageQuery:
+    """keyset page of a list endpoint, an invalid cursor is a 400"""
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except InvalidCursor:
+            raise HTTPException(status_code=400, detail="invalid cursor")
+    return PageQuery(cursor=cursor, limit=limit)
+
+
+def set_next_cursor(response: Response, cursor: Optional[str]) -> None:
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+
+
+def page_items(response: Response, page: Page, item_type: Any) -> ModelResponse:
+    """
+    list of item_type body of the page, the next cursor goes to the
+    X-Next-Cursor header
+    """
+    set_next_cursor(response, page.next_cursor)
+    return ModelResponse(List[item_type], page.items, response)
@@ -0,0 +1,149 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+# upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestMetrics:
+    """SQL statements of the current request, filled by the engine events"""
+
+    __slots__ = ("statements", "statement_seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.statement_seconds = 0.0
+
+
+class RouteMetrics:
+    """counters of one (method, route) since the worker started"""
+
+    __slots__ = ("buckets", "count", "seconds", "statuses", "statements", "sql")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.seconds = 0.0
+        self.statuses: Dict[int, int] = {}
+        self.statements = 0
+        self.sql = 0.0
+
+
+current_request: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    "current_request", default=None
+)
+routes: Dict[Tuple[str, str], RouteMetrics] = {}
+
+
+def record_statement(seconds: float) -> None:
+    "called by the engine events after every statement"
+    request = current_request.get()
+    if request is not None:
+        request.statements += 1
+        request.statement_seconds += seconds
+
+
+def record_request(
+    method: str, route: str, status: int, seconds: float, request: RequestMetrics
+) -> None:
+    metrics = routes.get((method, route))
+    if metrics is None:
+        metrics = routes[(method, route)] = RouteMetrics()
+    metrics.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+    metrics.count += 1
+    metrics.seconds += seconds
+    metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+    metrics.statements += request.statements
+    metrics.sql += request.statement_seconds
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording latency, status and SQL time per route
+    template (e.g. /api/admin/tenant/employee/{id}), unmatched paths are
+    counted under "<unmatched>".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        request = RequestMetrics()
+        token = current_request.set(request)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_request.reset(token)
+            route = scope.get("route")
+            record_request(
+                scope["method"],
+                getattr(route, "path_format", None) or "<unmatched>",
+                status,
+                elapsed,
+                request,
+            )
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{k}="{v}"' for k, v in labels.items())
+
+
+def prometheus() -> str:
+    """all route counters in the Prometheus text exposition format"""
+    lines: List[str] = [
+        "# HELP http_request_duration_seconds Request latency per route.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    items = sorted(routes.items())
+    for (method, route), m in items:
+        labels = _labels(method=method, route=route)
+        cumulative = 0
+        for le, n in zip((*LATENCY_BUCKETS, "+Inf"), m.buckets):
+            cumulative += n
+            lines.append(
+                f'http_request_duration_seconds_bucket{{{labels},le="{le}"}} '
+                f"{cumulative}"
+            )
+        lines.append(f"http_request_duration_seconds_sum{{{labels}}} {m.seconds}")
+        lines.append(f"http_request_duration_seconds_count{{{labels}}} {m.count}")
+
+    lines += [
+        "# HELP http_requests_total Responses per route and status.",
+        "# TYPE http_requests_total counter",
+    ]
+    for (method, route), m in items:
+        for status, n in sorted(m.statuses.items()):
+            labels = _labels(method=method, route=route, status=status)
+            lines.append(f"http_requests_total{{{labels}}} {n}")
+
+    lines += [
+        "# HELP db_statements_total SQL statements executed per route.",
+        "# TYPE db_statements_total counter",
+    ]
+    for (method, route), m in items:
+        labels = _labels(method=method, route=route)
+        lines.append(f"db_statements_total{{{labels}}} {m.statements}")
+
+    lines += [
+        "# HELP db_statement_seconds_total Time spent in SQL statements per route.",
+        "# TYPE db_statement_seconds_total counter",
+    ]
+    for (method, route), m in items:
+        labels = _labels(method=method, route=route)
+        lines.append(f"db_statement_seconds_total{{{labels}}} {m.sql}")
+    return "\n".join(lines) + "\n"
@@ -19,10 +19,59 @@ class Settings(BaseSettings):
     allow_methods: Optional[str] = "GET,POST,HEAD,OPTIONS"
     allow_headers: Optional[str] = "Authorization,Content-Type"
     production: Optional[bool] = False
+    # connection pool of api/sa/db.py, size workers x (pool + overflow)
+    # below the max_connections of postgres
+    db_pool_size: Optional[int] = 5
+    db_max_overflow: Optional[int] = 10
+    db_pool_timeout: Optional[float] = 30
+    db_pool_recycle: Optional[int] = 1800
+    db_pool_pre_ping: Optional[bool] = True
+    # asyncpg prepared statements cached per connection, disable prepared
+    # statements when connecting through pgbouncer in transaction mode
+    db_statement_cache_size: Optional[int] = 100
+    db_prepared_statements: Optional[bool] = True
+    # list endpoints, keyset pages of default size, limit query capped to max
+    page_size_default: Optional[int] = 100
+    page_size_max: Optional[int] = 500
+    # bulk employee import, rows per request and per multi-row INSERT
+    employee_import_max_rows: Optional[int] = 10000
+    employee_import_chunk_rows: Optional[int] = 1000
+    # attendance export, rows fetched from the server side cursor per chunk
+    export_chunk_rows: Optional[int] = 1000
     timezone: Optional[str] = (
         "Asia/Kolkata"
         # This will use for default queries which need to understand day/night
     )
+    geomarking_cache_ttl_second: Optional[int] = 300
+    geomarking_cache_size: Optional[int] = 1024
+    # validated employee sessions, revocations reach other workers within the ttl
+    employee_session_cache_ttl_second: Optional[int] = 30
+    employee_session_cache_size: Optional[int] = 10000
+    # active admins read by get_admin, (de)activation reaches other workers
+    # within the ttl
+    admin_cache_ttl_second: Optional[int] = 30
+    admin_cache_size: Optional[int] = 1024
+    # verified jwt payloads, an entry never outlives the exp of its token
+    jwt_cache_ttl_second: Optional[int] = 300
+    jwt_cache_size: Optional[int] = 10000
+    # rotate the access token row with a single upsert instead of delete + insert
+    employee_token_upsert_rotation: Optional[bool] = True
+    # pbkdf2 runs on a thread pool, calls beyond workers + queue limit get 503
+    password_hash_workers: Optional[int] = 2
+    password_hash_queue_limit: Optional[int] = 32
+    # pbkdf2_sha256 rounds of new hashes (benchmarks/bench_password.py),
+    # stored hashes with other rounds are rehashed on login
+    password_hash_rounds: Optional[int] = None
+    # queue attendance marks and write them in batches, one commit per batch
+    attendance_group_commit: Optional[bool] = False
+    attendance_group_commit_max_rows: Optional[int] = 200
+    attendance_group_commit_max_delay_ms: Optional[int] = 5
+
+    # statements slower than this are logged with their plan, 0 disables
+    slow_query_ms: Optional[int] = 500
+    # EXPLAIN ANALYZE (postgres, SELECT only) runs the slow statement again
+    slow_query_explain_analyze: Optional[bool] = False
+    slow_query_log_size: Optional[int] = 100
 
     COOKIE_PATH: Optional[str] = "/"
     COOKIE_SAMESITE: Optional[str] = "lax"
@@ -0,0 +1,116 @@
+import asyncio
+import contextvars
+import logging
+import sys
+import time
+from collections import deque
+from typing import Any, Deque, List, Optional
+
+import greenlet
+
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+# newest last, read by the owner endpoint
+entries: Deque[dict] = deque(maxlen=settings.slow_query_log_size)
+_explaining = False
+_tasks: set = set()
+
+
+def redact(parameters: Any) -> Any:
+    """parameter types in place of their values"""
+    if isinstance(parameters, dict):
+        return {k: type(v).__name__ for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(v).__name__ for v in parameters]
+    return type(parameters).__name__
+
+
+def caller(
+    package: str = "api.services", helpers: str = "api.services.cruds.base"
+) -> Optional[str]:
+    """
+    innermost api.services function on the stack, passing over the generic
+    CRUDBase helpers to the repo method calling them. Statements run in a
+    greenlet, the awaiting coroutines are on the stack of the parent greenlet.
+    """
+    current = greenlet.getcurrent()
+    stacks = [sys._getframe(1), current.parent.gr_frame if current.parent else None]
+    found = None
+    for frame in stacks:
+        while frame is not None:
+            module = frame.f_globals.get("__name__", "")
+            if module.startswith(package):
+                found = f"{module}.{frame.f_code.co_qualname}"
+                if module != helpers:
+                    return found
+            elif found:
+                return found
+            frame = frame.f_back
+    return found
+
+
+def observe(engine, statement: str, parameters, seconds: float, many: bool):
+    """
+    log a statement slower than settings.slow_query_ms and schedule its
+    EXPLAIN on a separate connection, the plan is added to the entry later
+    """
+    if statement.lstrip()[:7].upper() == "EXPLAIN":
+        return
+    entry = {
+        "at": time.time(),
+        "ms": round(seconds * 1000, 3),
+        "statement": statement,
+        "parameters": redact(parameters) if not many else f"{len(parameters)} rows",
+        "caller": caller(),
+        "plan": None,
+    }
+    entries.append(entry)
+    logger.warning(
+        "slow query %.1f ms in %s: %s %s",
+        entry["ms"],
+        entry["caller"],
+        statement,
+        entry["parameters"],
+    )
+    global _explaining
+    # one plan at a time, executemany statements have no single plan
+    if many or _explaining:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    _explaining = True
+    # a fresh context, the EXPLAIN is not counted in the request metrics
+    task = loop.create_task(
+        _explain(engine, entry, statement, parameters), context=contextvars.Context()
+    )
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+async def _explain(engine, entry: dict, statement: str, parameters):
+    global _explaining
+    try:
+        if engine.dialect.name == "postgresql":
+            # ANALYZE runs the statement again, only for reads
+            read = statement.lstrip()[:6].upper() == "SELECT"
+            analyze = settings.slow_query_explain_analyze and read
+            prefix = "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+        else:
+            prefix = "EXPLAIN QUERY PLAN "
+        async with engine.connect() as conn:
+            rows = await conn.exec_driver_sql(prefix + statement, parameters)
+            entry["plan"] = [" | ".join(str(v) for v in row) for row in rows]
+        logger.info("plan of slow query:\n%s", "\n".join(entry["plan"]))
+    except Exception as e:
+        entry["plan"] = [f"EXPLAIN failed: {e}"]
+    finally:
+        _explaining = False
+
+
+def recent() -> List[dict]:
+    """slow statements, newest first"""
+    return list(reversed(entries))
@@ -3,12 +3,13 @@ import logging
 import re
 import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional
 
 from fastapi import Request
 from jose import jwt
 from jose.exceptions import ExpiredSignatureError, JWTError
 
+from ..utlis.cache import TTLCache
 from .settings import settings
 
 logger = logging.getLogger()
@@ -17,6 +18,11 @@ logger = logging.getLogger()
 SECRET_KEY = settings.secret_key
 ALGORITHM = "HS256"
 
+# (token, claims) -> (exp, verified claims), shared by every auth entry point
+token_cache: TTLCache[tuple, tuple] = TTLCache(
+    maxsize=settings.jwt_cache_size, ttl=settings.jwt_cache_ttl_second, name="jwt"
+)
+
 
 def create_token(payload: dict, expire_second: int = None) -> str:
     "Default NO expiry"
@@ -26,9 +32,38 @@ def create_token(payload: dict, expire_second: int = None) -> str:
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def decode_token(token: str, claims: Callable[[dict], dict] = None) -> dict:
+    """
+    Verified payload of the token, like jwt.decode and raising the same
+    errors. Verified tokens are cached until their exp (at most the cache
+    ttl), an entry past its exp raises ExpiredSignatureError and is dropped.
+    claims post-processes the payload once and its result is what is cached,
+    callers must not modify the returned dict.
+    """
+    key = (token, claims)
+    entry = token_cache.get(key)
+    if entry is not None:
+        exp, payload = entry
+        if exp is None or exp > time.time():
+            return payload
+        token_cache.pop(key)
+        raise ExpiredSignatureError("Signature has expired.")
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    exp = payload.get("exp")
+    if claims is not None:
+        payload = claims(payload)
+    ttl = None if exp is None else exp - time.time()
+    if ttl is None or ttl > 0:
+        if ttl is not None and settings.jwt_cache_ttl_second is not None:
+            ttl = min(ttl, settings.jwt_cache_ttl_second)
+        token_cache.set(key, (exp, payload), ttl)
+    return payload
+
+
 def validate_token(token: str) -> Optional[dict]:
     try:
-        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        return decode_token(token)
     except ExpiredSignatureError as e:
         logger.error(f"ExpiredSignatureError:{str(e)}")
         return None
@@ -37,6 +72,11 @@ def validate_token(token: str) -> Optional[dict]:
         return None
 
 
+def token_digest(token: str) -> str:
+    "sha256 hex digest stored in place of a token"
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 def rotate_token(payload: dict, expires_delta: timedelta = None) -> str:
     return create_token(payload, expires_in=expires_delta)
 
@@ -0,0 +1,48 @@
+import uuid
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Union
+
+from pydantic import BaseModel, ConfigDict
+
+from api.models import AttendanceRead, EmployeeRead, GeoMarkingRead, UTCDatetime
+
+
+class UserRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: uuid.UUID
+    tenant_id: uuid.UUID
+    email: str
+    role: str
+    is_active: bool
+    created_at: datetime
+
+
+class MarkResponse(AttendanceRead):
+    place: Optional[str] = None
+
+
+class EmployeeState(EmployeeRead):
+    # {} when there is no mark today
+    state: Union[AttendanceRead, Dict[str, Any]] = {}
+    state_near: Optional[GeoMarkingRead] = None
+    today_in_near: Optional[GeoMarkingRead] = None
+    today_in: Union[AttendanceRead, Dict[str, Any]] = {}
+
+
+class EmployeeStatus(EmployeeRead):
+    last_marked_today: Optional[str] = None
+    device_locked: bool
+
+
+class AttendanceCardDay(BaseModel):
+    employee_id: uuid.UUID
+    attendance_date: date
+    first_in_time: Optional[UTCDatetime] = None
+    first_in_location: Optional[str] = None
+    first_in_distance: Optional[float] = None
+    last_out_time: Optional[UTCDatetime] = None
+    last_out_location: Optional[str] = None
+    last_out_distance: Optional[float] = None
+    total_in_count: int
+    day_status: str
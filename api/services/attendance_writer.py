@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from api.models import Attendance, AttendanceCreate
+from api.sa.db import async_session
+from api.sa.settings import settings
+from api.services.cruds.tenant import attendance_daily_repo, attendance_repo
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class QueuedMark:
+    obj_in: AttendanceCreate
+    location: Optional[str]
+    done: asyncio.Future = field(repr=False)
+
+
+class AttendanceWriter:
+    """
+    Group commit of attendance marks. Marks are queued and written by a
+    single task, a batch every max_delay_ms or max_rows marks, as one
+    multi-row INSERT plus the attendance_daily upserts in one commit. A
+    submit returns only once its batch is committed.
+
+    Batches are written one after the other in queue order, so the marks of
+    an employee reach attendance and attendance_daily in the order they were
+    submitted. When a batch fails its marks are retried one by one, and only
+    the failing marks raise.
+    """
+
+    def __init__(self, max_rows: int, max_delay_ms: int, session_factory=None):
+        self.max_rows = max_rows
+        self.max_delay = max_delay_ms / 1000
+        self.session_factory = session_factory or async_session
+        self.batches = 0
+        self.rows = 0
+        self.retried = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._full: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        # statuses queued but not committed yet, oldest first
+        self._pending: Dict[uuid.UUID, List[str]] = {}
+        # employee -> [lock, holders and waiters]
+        self._locks: Dict[uuid.UUID, list] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._stopping
+
+    async def start(self):
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._full = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="attendance-writer")
+
+    async def stop(self):
+        """write what is queued, then end the writer task"""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._queue.put_nowait(None)
+        self._full.set()
+        await self._task
+        self._task = None
+
+    def pending_status(self, employee_id: uuid.UUID) -> Optional[str]:
+        """status of the newest mark of the employee still waiting for commit"""
+        statuses = self._pending.get(employee_id)
+        return statuses[-1] if statuses else None
+
+    @asynccontextmanager
+    async def employee_lock(self, employee_id: uuid.UUID):
+        """
+        serializes the status check and submit of one employee's marks, a
+        second tap waits until the first mark is committed before checking
+        """
+        entry = self._locks.get(employee_id)
+        if entry is None:
+            entry = self._locks[employee_id] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._locks[employee_id]
+
+    async def submit(
+        self, obj_in: AttendanceCreate, location: Optional[str]
+    ) -> Attendance:
+        """queue the mark, return the stored row once its batch is committed"""
+        if not self.running:
+            raise RuntimeError("attendance writer is not running")
+        mark = QueuedMark(obj_in, location, asyncio.get_running_loop().create_future())
+        self._pending.setdefault(obj_in.employee_id, []).append(obj_in.status)
+        self._queue.put_nowait(mark)
+        if self._queue.qsize() >= self.max_rows:
+            self._full.set()
+        return await asyncio.shield(mark.done)
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "batches": self.batches,
+            "rows": self.rows,
+            "retried": self.retried,
+        }
+
+    async def _run(self):
+        queue = self._queue
+        while True:
+            first = await queue.get()
+            batch = [] if first is None else [first]
+            if not self._stopping and queue.qsize() < self.max_rows - 1:
+                # give concurrent requests a few milliseconds to join the batch
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+            while len(batch) < self.max_rows and not queue.empty():
+                mark = queue.get_nowait()
+                if mark is not None:
+                    batch.append(mark)
+            if batch:
+                await self._flush(batch)
+            if self._stopping and queue.empty():
+                return
+
+    async def _flush(self, batch: List[QueuedMark]):
+        rows = [Attendance.model_validate(mark.obj_in) for mark in batch]
+        try:
+            async with self.session_factory() as db:
+                stored = await attendance_repo.create_many(db, rows, commit=False)
+                by_id = {row.id: row for row in stored}
+                for row, mark in zip(rows, batch):
+                    await attendance_daily_repo.record(db, by_id[row.id], mark.location)
+                await db.commit()
+        except Exception:
+            logger.exception("attendance batch of %d failed, retrying", len(batch))
+            self.retried += len(batch)
+            for mark in batch:
+                await self._write_one(mark)
+        else:
+            self.batches += 1
+            self.rows += len(batch)
+            for row, mark in zip(rows, batch):
+                self._done(mark, result=by_id[row.id])
+
+    async def _write_one(self, mark: QueuedMark):
+        try:
+            async with self.session_factory() as db:
+                row = await attendance_repo.mark(db, mark.obj_in, mark.location)
+        except Exception as e:
+            self._done(mark, error=e)
+        else:
+            self._done(mark, result=row)
+
+    def _done(self, mark: QueuedMark, result=None, error=None):
+        statuses = self._pending.get(mark.obj_in.employee_id)
+        if statuses:
+            statuses.pop(0)
+            if not statuses:
+                del self._pending[mark.obj_in.employee_id]
+        if mark.done.done():
+            return
+        if error is not None:
+            mark.done.set_exception(error)
+        else:
+            mark.done.set_result(result)
+
+
+attendance_writer = AttendanceWriter(
+    settings.attendance_group_commit_max_rows,
+    settings.attendance_group_commit_max_delay_ms,
+)
@@ -1,14 +1,112 @@
 # db/base.py
+import base64
+import json
 import uuid
-from typing import Generic, List, Optional, Type, TypeVar
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, List, Optional, Sequence, Tuple, Type, TypeVar
 
-from sqlalchemy.sql import Select
+from sqlalchemy import Date, case, delete, func, tuple_, type_coerce, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.sql import ColumnElement, Select
 from sqlmodel import SQLModel, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from api.sa.settings import settings
+from api.utlis import dates
+
+
+def dialect_insert(db: AsyncSession):
+    """insert() of the session dialect, it carries the ON CONFLICT support"""
+    name = db.bind.dialect.name
+    if name == "postgresql":
+        return postgresql.insert
+    if name == "sqlite":
+        return sqlite.insert
+    raise NotImplementedError(f"upsert is not supported on {name}")
+
+
+def local_date(
+    db: AsyncSession,
+    column: ColumnElement,
+    start: datetime,
+    end: datetime,
+    tz: Optional[str] = None,
+) -> ColumnElement:
+    """
+    Local calendar date of a UTC timestamp column for rows in [start, end).
+    Postgres converts with the zone database, SQLite has none so the UTC
+    offsets in effect over the range are applied, one CASE branch per
+    daylight saving transition.
+    """
+    tz = tz or settings.timezone
+    if db.bind.dialect.name == "postgresql":
+        return type_coerce(func.date(func.timezone(tz, column)), Date)
+
+    def shifted(offset):
+        return func.date(column, f"{int(offset.total_seconds()) // 60:+d} minutes")
+
+    offsets = dates.utc_offsets(start, end, tz)
+    expr = shifted(offsets[-1][1])
+    if len(offsets) > 1:
+        expr = case(
+            *[
+                (column < since, shifted(offset))
+                for (since, _), (_, offset) in zip(offsets[1:], offsets)
+            ],
+            else_=expr,
+        )
+    return type_coerce(expr, Date)
+
+
 ModelType = TypeVar("ModelType", bound=SQLModel)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=SQLModel)
 updateSchemaType = TypeVar("updateSchemaType", bound=SQLModel)
+RowType = TypeVar("RowType")
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, id: uuid.UUID) -> str:
+    """opaque token of the (created_at, id) keyset position"""
+    raw = json.dumps([created_at.isoformat(), id.hex], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = json.loads(raw)
+        return datetime.fromisoformat(created_at), uuid.UUID(id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("invalid cursor") from e
+
+
+def page_limit(limit: Optional[int] = None) -> int:
+    """requested page size, defaulted and capped by settings"""
+    return max(1, min(limit or settings.page_size_default, settings.page_size_max))
+
+
+def keyset_page(
+    query: Select,
+    created_at: ColumnElement,
+    id: ColumnElement,
+    cursor: Optional[str],
+    limit: int,
+) -> Select:
+    """order by (created_at, id) after cursor, one extra row tells a next page"""
+    if cursor:
+        query = query.where(tuple_(created_at, id) > tuple_(*decode_cursor(cursor)))
+    return query.order_by(created_at, id).limit(limit + 1)
+
+
+@dataclass(slots=True, frozen=True)
+class Page(Generic[RowType]):
+    items: List[RowType]
+    # pass back to get the following page, None on the last page
+    next_cursor: Optional[str] = None
 
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, updateSchemaType]):
@@ -56,6 +154,40 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, updateSchemaType]):
     ) -> List[ModelType]:
         return await self._get_all(db)
 
+    async def _get_page(
+        self,
+        db: AsyncSession,
+        query: Optional[Select] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        scalars: bool = True,
+    ) -> Page[Any]:
+        """
+        One page of query in (created_at, id) order of the model, after the
+        position of cursor. The query may select extra columns after the
+        model (scalars=False), rows are then returned as they are.
+        """
+        limit = page_limit(limit)
+        query = query if query is not None else select(self.model)
+        query = keyset_page(query, self.model.created_at, self.model.id, cursor, limit)
+        result = await db.execute(query)
+        rows = result.scalars().all() if scalars else result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1] if scalars else rows[-1][0]
+            next_cursor = encode_cursor(last.created_at, last.id)
+        return Page(items=list(rows), next_cursor=next_cursor)
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Page[ModelType]:
+        return await self._get_page(db, cursor=cursor, limit=limit)
+
     async def create(self, db: AsyncSession, obj_in: CreateSchemaType) -> ModelType:
         db_obj = self.model.model_validate(obj_in)
         db.add(db_obj)
@@ -70,6 +202,119 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, updateSchemaType]):
         db.add(db_obj)
         return db_obj
 
+    async def upsert(
+        self,
+        db: AsyncSession,
+        obj_in: CreateSchemaType,
+        index_elements: Sequence[str],
+        update_fields: Optional[Sequence[str]] = None,
+        commit: bool = True,
+    ) -> ModelType:
+        """
+        INSERT .. ON CONFLICT (index_elements) DO UPDATE as a single statement,
+        returning the stored row. The conflicting row keeps its id, and every
+        other field (or only update_fields) is overwritten.
+        """
+        values = self.model.model_validate(obj_in).model_dump()
+        stmt = dialect_insert(db)(self.model).values(**values)
+        update_fields = update_fields or [
+            k for k in values if k != "id" and k not in index_elements
+        ]
+        stmt = (
+            stmt.on_conflict_do_update(
+                index_elements=index_elements,
+                set_={k: stmt.excluded[k] for k in update_fields},
+            )
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        db_obj = (await db.execute(stmt)).scalar_one()
+        if commit:
+            await db.commit()
+        return db_obj
+
+    async def create_many(
+        self,
+        db: AsyncSession,
+        objs_in: Sequence[CreateSchemaType],
+        ignore_conflicts: Optional[Sequence[str]] = None,
+        commit: bool = True,
+    ) -> List[ModelType]:
+        """
+        Insert all objects with one INSERT statement (batched multi-row
+        VALUES), returning the stored rows. With ignore_conflicts rows that
+        conflict on those columns are skipped (ON CONFLICT DO NOTHING) and
+        missing from the result.
+        """
+        if not objs_in:
+            return []
+        values = [self.model.model_validate(o).model_dump() for o in objs_in]
+        stmt = dialect_insert(db)(self.model)
+        if ignore_conflicts:
+            stmt = stmt.on_conflict_do_nothing(index_elements=ignore_conflicts)
+        result = await db.execute(
+            stmt.returning(self.model).execution_options(populate_existing=True),
+            values,
+        )
+        db_objs = list(result.scalars().all())
+        if commit:
+            await db.commit()
+        return db_objs
+
+    async def update_many(
+        self,
+        db: AsyncSession,
+        values: Sequence[dict],
+        commit: bool = True,
+    ) -> None:
+        """
+        Bulk UPDATE by primary key, every dict carries the id and the fields
+        to set on that row. Runs as one executemany of the UPDATE statement.
+        """
+        if not values:
+            return
+        await db.execute(update(self.model), list(values))
+        if commit:
+            await db.commit()
+
+    async def update_where(
+        self,
+        db: AsyncSession,
+        values: dict,
+        *where: ColumnElement[bool],
+        returning: bool = False,
+        commit: bool = True,
+    ) -> int | List[ModelType]:
+        """
+        UPDATE .. SET values WHERE filters as a single statement. Returns the
+        number of rows updated, or the updated rows when returning is set.
+        """
+        stmt = update(self.model).where(*where).values(**values)
+        if returning:
+            stmt = stmt.returning(self.model).execution_options(populate_existing=True)
+        result = await db.execute(stmt)
+        updated = list(result.scalars().all()) if returning else result.rowcount
+        if commit:
+            await db.commit()
+        return updated
+
+    async def delete_many(
+        self, db: AsyncSession, ids: Sequence[uuid.UUID], commit: bool = True
+    ) -> int:
+        """DELETE of the given ids, returns the number of rows deleted"""
+        if not ids:
+            return 0
+        return await self.delete_where(db, self.model.id.in_(ids), commit=commit)
+
+    async def delete_where(
+        self, db: AsyncSession, *where: ColumnElement[bool], commit: bool = True
+    ) -> int:
+        """DELETE .. WHERE filters as a single statement, returns the row count"""
+        result = await db.execute(delete(self.model).where(*where))
+        if commit:
+            await db.commit()
+        return result.rowcount
+
     async def delete(self, db: AsyncSession, id: uuid.UUID) -> None:
         obj = await self._get(db, select(self.model).where(self.model.id == id))
         if obj:
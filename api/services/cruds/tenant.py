@@ -1,23 +1,29 @@
 import uuid
-import zoneinfo
-from datetime import date, datetime, timedelta, timezone
-from typing import List, Tuple
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, case, delete, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 from sqlmodel import desc, func, text
 
 from api.models.token import Token, TokenCreate, TokenUpdate
 from api.sa.settings import settings
+from api.sa.utils import token_digest
+from api.utlis import dates, geo
+from api.utlis.cache import TTLCache
 
 from ...models import (
     Attendance,
     AttendanceCreate,
+    AttendanceDaily,
     Employee,
     EmployeeCreate,
     EmployeeUpdate,
     GeoMarking,
     GeoMarkingCreate,
+    GeoMarkingSnapshot,
     GeoMarkingUpdate,
     Tenant,
     TenantCreate,
@@ -26,45 +32,107 @@ from ...models import (
     UserCreate,
     UserUpdate,
 )
-from .base import CRUDBase
+from .base import (
+    CRUDBase,
+    Page,
+    dialect_insert,
+    encode_cursor,
+    keyset_page,
+    local_date,
+    page_limit,
+)
+
+
+@dataclass(slots=True, frozen=True)
+class EmployeeSession:
+    token: Token
+    employee: Employee
+
+
+# (tenant_id, employee_id, device_hash) -> validated employee session
+employee_session_cache: TTLCache[Tuple[uuid.UUID, uuid.UUID, str], EmployeeSession] = (
+    TTLCache(
+        maxsize=settings.employee_session_cache_size,
+        ttl=settings.employee_session_cache_ttl_second,
+        name="employee_session",
+    )
+)
+
+
+def forget_employee_sessions(tenant_id: uuid.UUID, employee_id: uuid.UUID) -> int:
+    """drop cached sessions of the employee on every device"""
+    return employee_session_cache.discard_where(
+        lambda key, _: key[0] == tenant_id and key[1] == employee_id
+    )
+
+
+# user id -> snapshot of the active admin, revocations reach other workers
+# within the ttl
+admin_cache: TTLCache[uuid.UUID, User] = TTLCache(
+    maxsize=settings.admin_cache_size,
+    ttl=settings.admin_cache_ttl_second,
+    name="admin",
+)
+
+
+def forget_tenant_admins(tenant_id: uuid.UUID) -> int:
+    """drop cached admins of the tenant"""
+    return admin_cache.discard_where(lambda _, user: user.tenant_id == tenant_id)
 
 
 class TenantRepo(CRUDBase[Tenant, TenantCreate, TenantUpdate]):
 
+    async def set_active(self, db: AsyncSession, id: uuid.UUID, is_active: bool):
+        tenants = await self.update_where(
+            db, {"is_active": is_active}, self.model.id == id, returning=True
+        )
+        forget_tenant_admins(id)
+        return tenants[0] if tenants else None
+
     async def deactivate(self, db: AsyncSession, id: uuid.UUID):
-        tenant = await self.get(db, id)
-        if not tenant:
-            return None
-        obj_in = TenantUpdate.model_validate(tenant)
-        obj_in.is_active = False
-        return await super().update(db, id, obj_in)
+        return await self.set_active(db, id, False)
 
     async def activate(self, db: AsyncSession, id: uuid.UUID):
-        tenant = await self.get(db, id)
-        if not tenant:
-            return None
-        obj_in = TenantUpdate.model_validate(tenant)
-        obj_in.is_active = True
-        return await super().update(db, id, obj_in)
+        return await self.set_active(db, id, True)
 
 
 class userRepo(CRUDBase[User, UserCreate, UserUpdate]):
 
+    async def set_active(self, db: AsyncSession, id: uuid.UUID, is_active: bool):
+        users = await self.update_where(
+            db, {"is_active": is_active}, self.model.id == id, returning=True
+        )
+        admin_cache.pop(id)
+        return users[0] if users else None
+
     async def deactivate(self, db: AsyncSession, id: uuid.UUID):
-        user = await self.get(db, id)
-        if not user:
-            return None
-        obj_in = UserUpdate.model_validate(user)
-        obj_in.is_active = False
-        return await super().update(db, id, obj_in)
+        return await self.set_active(db, id, False)
 
     async def activate(self, db: AsyncSession, id: uuid.UUID):
-        user = await self.get(db, id)
-        if not user:
-            return None
-        obj_in = UserUpdate.model_validate(user)
-        obj_in.is_active = True
-        return await super().update(db, id, obj_in)
+        return await self.set_active(db, id, True)
+
+    async def update_password_hash(
+        self, db: AsyncSession, id: uuid.UUID, password_hash: str
+    ) -> None:
+        """store a new password hash of user (rehash on login)"""
+        await self.update_where(
+            db, {"password_hash": password_hash}, self.model.id == id
+        )
+        admin_cache.pop(id)
+
+    async def get_page_by_tenant(
+        self,
+        db: AsyncSession,
+        tenant_id: uuid.UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Page[User]:
+        return await self._get_page(
+            db,
+            select(self.model).where(self.model.tenant_id == tenant_id),
+            cursor=cursor,
+            limit=limit,
+        )
 
     async def get_user_by_email(self, db: AsyncSession, email: str) -> User | None:
         """get user details with email(username) or None"""
@@ -87,35 +155,72 @@ class EmployeeRepo(CRUDBase[Employee, EmployeeCreate, EmployeeUpdate]):
             db, query=select(self.model).where(self.model.tenant_id == tenant_id)
         )
 
+    async def get_page(
+        self,
+        db: AsyncSession,
+        tenant_id: uuid.UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Page[Employee]:
+        return await self._get_page(
+            db,
+            select(self.model).where(self.model.tenant_id == tenant_id),
+            cursor=cursor,
+            limit=limit,
+        )
+
+    async def insert_new(
+        self, db: AsyncSession, employees: List[EmployeeCreate]
+    ) -> dict:
+        """
+        Multi-row INSERT skipping rows whose employee_no already exists, the
+        caller commits. Returns employee_no -> id of the inserted rows.
+        """
+        created = await self.create_many(
+            db, employees, ignore_conflicts=["employee_no"], commit=False
+        )
+        return {e.employee_no: e.id for e in created}
+
     async def update(
         self, db: AsyncSession, tenant_id: uuid.UUID, id: uuid.UUID, obj_in
     ):
-        return await super().update(
+        employee = await super().update(
             db,
             id,
             obj_in,
             query=select(self.model).where(self.model.tenant_id == tenant_id),
         )
+        forget_employee_sessions(tenant_id, id)
+        return employee
+
+    async def set_active(
+        self, db: AsyncSession, tenant_id: uuid.UUID, id: uuid.UUID, is_active: bool
+    ):
+        employees = await self.update_where(
+            db,
+            {"is_active": is_active},
+            self.model.tenant_id == tenant_id,
+            self.model.id == id,
+            returning=True,
+        )
+        forget_employee_sessions(tenant_id, id)
+        return employees[0] if employees else None
 
     async def deactivate(self, db: AsyncSession, tenant_id: uuid.UUID, id: uuid.UUID):
-        employee = await self.get(db, tenant_id, id)
-        if not employee:
-            return None
-        obj_in = EmployeeUpdate.model_validate(employee)
-        obj_in.is_active = False
-        return await super().update(db, id, obj_in)
+        return await self.set_active(db, tenant_id, id, False)
 
     async def activate(self, db: AsyncSession, tenant_id: uuid.UUID, id: uuid.UUID):
-        employee = await self.get(db, tenant_id, id)
-        if not employee:
-            return None
-        obj_in = EmployeeUpdate.model_validate(employee)
-        obj_in.is_active = True
-        return await super().update(db, id, obj_in)
+        return await self.set_active(db, tenant_id, id, True)
 
-    async def get_employee_status(self, db: AsyncSession, tenant_id: uuid.UUID):
+    async def get_employee_status(
+        self,
+        db: AsyncSession,
+        tenant_id: uuid.UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Page[dict]:
 
-        today = date.today()
+        start, end = dates.utc_range(dates.local_today())
 
         attendance_subquery = (
             select(
@@ -129,8 +234,9 @@ class EmployeeRepo(CRUDBase[Employee, EmployeeCreate, EmployeeUpdate]):
                 )
                 .label("rownum"),
             )
-            .where(func.date(Attendance.timestamp) == today)
             .where(Attendance.tenant_id == tenant_id)
+            .where(Attendance.timestamp >= start)
+            .where(Attendance.timestamp < end)
             .subquery()
         )
 
@@ -163,21 +269,22 @@ class EmployeeRepo(CRUDBase[Employee, EmployeeCreate, EmployeeUpdate]):
             .where(Employee.tenant_id == tenant_id)
         )
 
-        results = await db.execute(statement)
-        rows = results.all()
+        page = await self._get_page(
+            db, statement, cursor=cursor, limit=limit, scalars=False
+        )
 
         # Example of processing the result
         employee_data = []
-        for emp, attendance, token in rows:
+        for emp, attendance, token in page.items:
 
             employee_data.append(
                 {
-                    **emp.model_dump(),
+                    **dict(emp),
                     "last_marked_today": attendance,
                     "device_locked": token is not None,
                 }
             )
-        return employee_data
+        return Page(items=employee_data, next_cursor=page.next_cursor)
 
 
 class TokenRepo(CRUDBase[Token, TokenCreate, TokenUpdate]):
@@ -198,14 +305,95 @@ class TokenRepo(CRUDBase[Token, TokenCreate, TokenUpdate]):
         )
 
     async def get_token_token(self, db: AsyncSession, token: str):
-        return await self._get(db, select(Token).where(Token.token_hash == token))
+        """token row of a jwt, rows store the sha256 digest of their jwt"""
+        return await self._get(
+            db, select(Token).where(Token.token_hash == token_digest(token))
+        )
 
 
 class GeoMarkingRepo(CRUDBase[GeoMarking, GeoMarkingCreate, GeoMarkingUpdate]):
 
-    async def get_all_by_tenant(self, db: AsyncSession, tenant_id: uuid.UUID):
-        return await self._get_all(
-            db, select(GeoMarking).where(GeoMarking.tenant_id == tenant_id)
+    def __init__(self, model):
+        super().__init__(model)
+        # tenant_id -> spatial index over snapshots of the tenant markings
+        self.cache: TTLCache[uuid.UUID, geo.GeoIndex[GeoMarkingSnapshot]] = TTLCache(
+            maxsize=settings.geomarking_cache_size,
+            ttl=settings.geomarking_cache_ttl_second,
+            name="geomarking",
+        )
+        # tenant_id -> count of writes, a load only fills the cache when no
+        # write landed while it was reading
+        self._generation: Dict[uuid.UUID, int] = {}
+
+    async def get_index(
+        self, db: AsyncSession, tenant_id: uuid.UUID
+    ) -> geo.GeoIndex[GeoMarkingSnapshot]:
+        """get the spatial index of tenant markings, load it on cache miss"""
+        index = self.cache.get(tenant_id)
+        if index is None:
+            generation = self._generation.get(tenant_id, 0)
+            markings = await self._get_all(
+                db, select(GeoMarking).where(GeoMarking.tenant_id == tenant_id)
+            )
+            index = geo.GeoIndex(
+                [GeoMarkingSnapshot.from_model(m) for m in markings],
+                location_extract_method=lambda loc: (loc.latitude, loc.longitude),
+            )
+            if self._generation.get(tenant_id, 0) == generation:
+                self.cache.set(tenant_id, index)
+        return index
+
+    def invalidate(self, tenant_id: uuid.UUID):
+        "drop the cached index of tenant, loads already running do not store"
+        self._generation[tenant_id] = self._generation.get(tenant_id, 0) + 1
+        self.cache.pop(tenant_id)
+
+    async def find_nearest(
+        self,
+        db: AsyncSession,
+        tenant_id: uuid.UUID,
+        lat: float,
+        lon: float,
+        max_distance: float = None,
+    ) -> Tuple[GeoMarkingSnapshot | None, float]:
+        """nearest marking of tenant and the distance to it (km)"""
+        index = await self.get_index(db, tenant_id)
+        return index.nearest(lat, lon, max_distance=max_distance)
+
+    async def create(self, db: AsyncSession, obj_in: GeoMarkingCreate) -> GeoMarking:
+        geomarking = await super().create(db, obj_in)
+        self.invalidate(geomarking.tenant_id)
+        return geomarking
+
+    async def update(
+        self,
+        db: AsyncSession,
+        id: uuid.UUID,
+        obj_in: GeoMarkingUpdate,
+        query=None,
+    ) -> GeoMarking | None:
+        geomarking = await super().update(db, id, obj_in, query=query)
+        if geomarking:
+            self.invalidate(geomarking.tenant_id)
+        return geomarking
+
+    async def get_all_by_tenant(
+        self, db: AsyncSession, tenant_id: uuid.UUID
+    ) -> List[GeoMarkingSnapshot]:
+        return list((await self.get_index(db, tenant_id)).locations)
+
+    async def get_page_by_tenant(
+        self,
+        db: AsyncSession,
+        tenant_id: uuid.UUID,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Page[GeoMarking]:
+        return await self._get_page(
+            db,
+            select(self.model).where(self.model.tenant_id == tenant_id),
+            cursor=cursor,
+            limit=limit,
         )
 
     async def get(self, db: AsyncSession, tenant_id: uuid.UUID, id: uuid.UUID):
@@ -222,12 +410,14 @@ class AttendanceRepo(CRUDBase[Attendance, AttendanceCreate, AttendanceCreate]):
     async def get_today(
         self, db: AsyncSession, tenant_id: uuid.UUID, employee_id: uuid.UUID
     ) -> List[Attendance]:
+        start, end = dates.utc_range(dates.local_today())
         return await self._get_all(
             db,
             select(Attendance)
             .where(Attendance.tenant_id == tenant_id)
             .where(Attendance.employee_id == employee_id)
-            .where(func.date(Attendance.timestamp) == date.today()),
+            .where(Attendance.timestamp >= start)
+            .where(Attendance.timestamp < end),
         )
 
     async def get_by_date(
@@ -237,6 +427,7 @@ class AttendanceRepo(CRUDBase[Attendance, AttendanceCreate, AttendanceCreate]):
         employee_id: uuid.UUID,
         target_date: date,
     ):
+        start, end = dates.utc_range(target_date)
         return await self._get_all(
             db,
             select(Attendance, Employee, GeoMarking)
@@ -244,16 +435,15 @@ class AttendanceRepo(CRUDBase[Attendance, AttendanceCreate, AttendanceCreate]):
             .join(GeoMarking, Attendance.geo_marking_id == GeoMarking.id)
             .where(Attendance.tenant_id == tenant_id)
             .where(Attendance.employee_id == employee_id)
-            .where(func.date(Attendance.timestamp) == target_date),
+            .where(Attendance.timestamp >= start)
+            .where(Attendance.timestamp < end),
         )
 
     async def last_mark_today(
         self, db: AsyncSession, tenant_id: uuid.UUID, employee_id: uuid.UUID
     ) -> Tuple[GeoMarking, Attendance]:
 
-        today = date.today()  # <class 'datetime.date'>
-        start_of_today = datetime.combine(today, datetime.min.time())
-        start_of_tomorrow = start_of_today + timedelta(days=1)
+        start_of_today, start_of_tomorrow = dates.utc_range(dates.local_today())
         query = (
             select(GeoMarking, Attendance)
             .join(GeoMarking, Attendance.geo_marking_id == GeoMarking.id)
@@ -272,18 +462,15 @@ class AttendanceRepo(CRUDBase[Attendance, AttendanceCreate, AttendanceCreate]):
     async def today_in(
         self, db: AsyncSession, tenant_id: uuid.UUID, employee_id: uuid.UUID
     ) -> Attendance:
-        client_tz = zoneinfo.ZoneInfo(settings.timezone)
-        today = datetime.now(tz=client_tz).date()  # <class 'datetime.date'>
-        start_of_today = datetime.combine(today, datetime.min.time(), tzinfo=client_tz)
-        start_of_tomorrow = start_of_today + timedelta(days=1)
+        start_of_today, start_of_tomorrow = dates.utc_range(dates.local_today())
         query = (
             select(GeoMarking, Attendance)
             .join(GeoMarking, Attendance.geo_marking_id == GeoMarking.id)
             .where(Attendance.tenant_id == tenant_id)
             .where(Attendance.employee_id == employee_id)
             .where(Attendance.status == "IN")
-            .where(Attendance.timestamp >= start_of_today.astimezone(timezone.utc))
-            .where(Attendance.timestamp < start_of_tomorrow.astimezone(timezone.utc))
+            .where(Attendance.timestamp >= start_of_today)
+            .where(Attendance.timestamp < start_of_tomorrow)
             .order_by(Attendance.timestamp)
             .limit(1)
         )
@@ -292,6 +479,262 @@ class AttendanceRepo(CRUDBase[Attendance, AttendanceCreate, AttendanceCreate]):
             return row  # (GeoMarking, Attendance)
         return None, None  # Always return a tuple
 
+    def daily_summary(
+        self,
+        db: AsyncSession,
+        start_date: date,
+        end_date: date,
+        tenant_id: Optional[uuid.UUID] = None,
+        employee_id: Optional[uuid.UUID] = None,
+    ) -> Select:
+        """
+        Per employee and local day summary computed from attendance in one
+        pass over the range, the same columns as attendance_daily. Window
+        aggregates find the first IN, the last OUT and the last mark of each
+        day, conditional aggregates fold them into one row per day. Portable
+        between postgres and sqlite.
+        """
+        start, end = dates.utc_range(start_date, end_date)
+        marks = (
+            select(
+                Attendance.tenant_id,
+                Attendance.employee_id,
+                local_date(db, Attendance.timestamp, start, end).label("local_date"),
+                Attendance.timestamp,
+                Attendance.status,
+                Attendance.distance_from_marking.label("distance"),
+                GeoMarking.name.label("location"),
+            )
+            .outerjoin(GeoMarking, Attendance.geo_marking_id == GeoMarking.id)
+            .where(Attendance.timestamp >= start)
+            .where(Attendance.timestamp < end)
+        )
+        if tenant_id is not None:
+            marks = marks.where(Attendance.tenant_id == tenant_id)
+        if employee_id is not None:
+            marks = marks.where(Attendance.employee_id == employee_id)
+        marks = marks.subquery("marks")
+
+        # one window partition per employee day, shared by the three aggregates
+        per_day = (marks.c.employee_id, marks.c.local_date)
+        is_in, is_out = marks.c.status == "IN", marks.c.status == "OUT"
+        ranked = select(
+            marks,
+            func.min(case((is_in, marks.c.timestamp)))
+            .over(partition_by=per_day)
+            .label("first_in_at"),
+            func.max(case((is_out, marks.c.timestamp)))
+            .over(partition_by=per_day)
+            .label("last_out_at"),
+            func.max(marks.c.timestamp).over(partition_by=per_day).label("last_at"),
+        ).subquery("ranked")
+
+        m = ranked.c
+        first_in = and_(m.status == "IN", m.timestamp == m.first_in_at)
+        last_out = and_(m.status == "OUT", m.timestamp == m.last_out_at)
+        return (
+            select(
+                m.tenant_id,
+                m.employee_id,
+                m.local_date,
+                func.max(case((first_in, m.timestamp))).label("first_in_time"),
+                func.max(case((first_in, m.location))).label("first_in_location"),
+                func.max(case((first_in, m.distance))).label("first_in_distance"),
+                func.max(case((last_out, m.timestamp))).label("last_out_time"),
+                func.max(case((last_out, m.location))).label("last_out_location"),
+                func.max(case((last_out, m.distance))).label("last_out_distance"),
+                func.max(case((m.timestamp == m.last_at, m.status))).label(
+                    "last_status"
+                ),
+                func.sum(case((m.status == "IN", 1), else_=0)).label("total_in_count"),
+                func.max(m.timestamp).label("updated_at"),
+            )
+            .group_by(m.tenant_id, m.employee_id, m.local_date)
+            .order_by(m.employee_id, m.local_date)
+        )
+
+    async def mark(
+        self, db: AsyncSession, obj_in: AttendanceCreate, location: Optional[str]
+    ) -> Attendance:
+        """insert the mark and fold it into attendance_daily in one commit"""
+        db_obj = await self.create_in_transaction(db, obj_in)
+        await attendance_daily_repo.record(db, db_obj, location)
+        await db.commit()
+        return db_obj
+
+
+class AttendanceDailyRepo(CRUDBase[AttendanceDaily, AttendanceDaily, AttendanceDaily]):
+
+    async def record(
+        self, db: AsyncSession, attendance: Attendance, location: Optional[str]
+    ) -> None:
+        """
+        Fold a new mark into its day row with a single upsert, the caller
+        commits. The first IN of the day is kept, the OUT always replaces
+        the last out and the IN count is incremented in place.
+        """
+        is_in = attendance.status == "IN"
+        ts = attendance.timestamp
+        dist = attendance.distance_from_marking
+        stmt = dialect_insert(db)(AttendanceDaily).values(
+            tenant_id=attendance.tenant_id,
+            employee_id=attendance.employee_id,
+            local_date=dates.local_date(ts),
+            first_in_time=ts if is_in else None,
+            first_in_location=location if is_in else None,
+            first_in_distance=dist if is_in else None,
+            last_out_time=None if is_in else ts,
+            last_out_location=None if is_in else location,
+            last_out_distance=None if is_in else dist,
+            last_status=attendance.status,
+            total_in_count=1 if is_in else 0,
+            updated_at=ts,
+        )
+        day, new = AttendanceDaily.__table__.c, stmt.excluded
+        no_first_in = day.first_in_time.is_(None)
+        is_out = new.last_out_time.is_not(None)
+        set_ = {}
+        for k in ("time", "location", "distance"):
+            set_[f"first_in_{k}"] = case(
+                (no_first_in, new[f"first_in_{k}"]), else_=day[f"first_in_{k}"]
+            )
+            set_[f"last_out_{k}"] = case(
+                (is_out, new[f"last_out_{k}"]), else_=day[f"last_out_{k}"]
+            )
+        set_.update(
+            last_status=new.last_status,
+            total_in_count=day.total_in_count + new.total_in_count,
+            updated_at=new.updated_at,
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["tenant_id", "employee_id", "local_date"], set_=set_
+            )
+        )
+
+    async def get_range(
+        self,
+        db: AsyncSession,
+        tenant_id: uuid.UUID,
+        employee_id: uuid.UUID,
+        start_date: date,
+        end_date: date,
+    ) -> List[AttendanceDaily]:
+        """days with at least one IN, oldest first"""
+        return await self._get_all(
+            db,
+            select(AttendanceDaily)
+            .where(AttendanceDaily.tenant_id == tenant_id)
+            .where(AttendanceDaily.employee_id == employee_id)
+            .where(AttendanceDaily.local_date >= start_date)
+            .where(AttendanceDaily.local_date <= end_date)
+            .where(AttendanceDaily.first_in_time.is_not(None))
+            .order_by(AttendanceDaily.local_date),
+        )
+
+    async def tenant_report(
+        self,
+        db: AsyncSession,
+        tenant_id: uuid.UUID,
+        start_date: date,
+        end_date: date,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Page[Tuple[uuid.UUID, str, str, Optional[AttendanceDaily]]]:
+        """
+        Day rows of a page of the tenant employees, in one statement: the
+        keyset page of employees joined to their attendance_daily range.
+        Rows are (employee_id, employee_no, name, day or None), employees
+        without any day in the range appear once with None.
+        """
+        limit = page_limit(limit)
+        employees = keyset_page(
+            select(
+                Employee.id, Employee.employee_no, Employee.name, Employee.created_at
+            ).where(Employee.tenant_id == tenant_id),
+            Employee.created_at,
+            Employee.id,
+            cursor,
+            limit,
+        ).cte("employee_page")
+        query = (
+            select(
+                employees.c.id,
+                employees.c.employee_no,
+                employees.c.name,
+                employees.c.created_at,
+                AttendanceDaily,
+            )
+            .outerjoin(
+                AttendanceDaily,
+                and_(
+                    AttendanceDaily.tenant_id == tenant_id,
+                    AttendanceDaily.employee_id == employees.c.id,
+                    AttendanceDaily.local_date >= start_date,
+                    AttendanceDaily.local_date <= end_date,
+                    AttendanceDaily.first_in_time.is_not(None),
+                ),
+            )
+            .order_by(
+                employees.c.created_at, employees.c.id, AttendanceDaily.local_date
+            )
+        )
+
+        rows, positions, next_cursor = [], [], None
+        for id, employee_no, name, created_at, day in (await db.execute(query)).all():
+            if not positions or positions[-1][1] != id:
+                if len(positions) == limit:
+                    # first row of the extra employee, next page starts there
+                    next_cursor = encode_cursor(*positions[-1])
+                    break
+                positions.append((created_at, id))
+            rows.append((id, employee_no, name, day))
+        return Page(items=rows, next_cursor=next_cursor)
+
+    async def rebuild(
+        self,
+        db: AsyncSession,
+        tenant_id: Optional[uuid.UUID] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> int:
+        """
+        Recompute the day rows from attendance (backfill) with a single
+        INSERT .. SELECT of the daily summary. Existing rows in the range are
+        replaced in the same transaction, returns the rows written.
+        """
+        if start_date is None or end_date is None:
+            bounds = select(
+                func.min(Attendance.timestamp), func.max(Attendance.timestamp)
+            )
+            if tenant_id is not None:
+                bounds = bounds.where(Attendance.tenant_id == tenant_id)
+            first, last = (await db.execute(bounds)).one()
+            if first is None:
+                return 0
+            start_date = start_date or dates.local_date(first)
+            end_date = end_date or dates.local_date(last)
+
+        stale = (
+            delete(AttendanceDaily)
+            .where(AttendanceDaily.local_date >= start_date)
+            .where(AttendanceDaily.local_date <= end_date)
+        )
+        if tenant_id is not None:
+            stale = stale.where(AttendanceDaily.tenant_id == tenant_id)
+        await db.execute(stale)
+
+        summary = attendance_repo.daily_summary(
+            db, start_date, end_date, tenant_id=tenant_id
+        )
+        result = await db.execute(
+            insert(AttendanceDaily).from_select(
+                [c.name for c in summary.selected_columns], summary
+            )
+        )
+        await db.commit()
+        return result.rowcount
+
 
 tenant_repo = TenantRepo(Tenant)
 user_repo = userRepo(User)
@@ -299,3 +742,4 @@ employee_repo = EmployeeRepo(Employee)
 token_repo = TokenRepo(Token)
 geomarking_repo = GeoMarkingRepo(GeoMarking)
 attendance_repo = AttendanceRepo(Attendance)
+attendance_daily_repo = AttendanceDailyRepo(AttendanceDaily)
@@ -1,36 +1,49 @@
 import logging
 import uuid
-import zoneinfo
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta, timezone
-from typing import Optional, Tuple
+from typing import Any, AsyncIterator, List, Optional, Sequence, Tuple
 
-from pydantic import BaseModel
-from sqlalchemy import select, text
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Row, select
 
+from api.models import EmployeeCreateSchema
 from api.sa.auth import Levels
-from api.sa.db import AsyncSession
+from api.sa.db import AsyncSession, async_session
 from api.sa.settings import settings
-from api.sa.utils import create_token, revoke_token, rotate_token, validate_token
+from api.sa.utils import (
+    create_token,
+    revoke_token,
+    rotate_token,
+    token_digest,
+    validate_token,
+)
 from api.schema.general import Coordinate
+from api.services.attendance_writer import attendance_writer
 from api.services.cruds.tenant import (
     Attendance,
     AttendanceCreate,
+    AttendanceDaily,
     AttendanceRepo,
     Employee,
+    EmployeeCreate,
     EmployeeRepo,
+    EmployeeSession,
     GeoMarking,
     Tenant,
     Token,
     TokenCreate,
     TokenRepo,
+    attendance_daily_repo,
     attendance_repo,
     employee_repo,
+    employee_session_cache,
+    forget_employee_sessions,
     geomarking_repo,
     tenant_repo,
     token_repo,
 )
-from api.utlis import geo
+from api.utlis import dates
 
 logger = logging.getLogger()
 
@@ -43,6 +56,36 @@ class JwtToken(BaseModel):
     level_: str
 
 
+CARD_DAY_COLUMNS = (
+    "attendance_date",
+    "first_in_time",
+    "first_in_location",
+    "first_in_distance",
+    "last_out_time",
+    "last_out_location",
+    "last_out_distance",
+    "total_in_count",
+    "day_status",
+)
+
+
+def card_day(day: AttendanceDaily) -> dict:
+    """attendance card row of a day, the last out is hidden while still IN"""
+    incomplete = day.last_status == "IN"
+    return {
+        "employee_id": day.employee_id,
+        "attendance_date": day.local_date,
+        "first_in_time": day.first_in_time,
+        "first_in_location": day.first_in_location,
+        "first_in_distance": day.first_in_distance,
+        "last_out_time": None if incomplete else day.last_out_time,
+        "last_out_location": None if incomplete else day.last_out_location,
+        "last_out_distance": None if incomplete else day.last_out_distance,
+        "total_in_count": day.total_in_count,
+        "day_status": "INCOMPLETE" if incomplete else "COMPLETE",
+    }
+
+
 @dataclass(slots=True, frozen=True)
 class EmployeeService:
     employee_repo: EmployeeRepo = field(default=employee_repo, init=False, repr=False)
@@ -136,7 +179,11 @@ class EmployeeService:
 
     async def validate_employee_session(
         self, db: AsyncSession, access_token: str, refresh_token: str, device_hash: str
-    ) -> Tuple[Token, bool] | None:
+    ) -> Tuple[Token, str | None] | None:
+        """
+        (access token row, new access jwt) of a valid session, the jwt is set
+        only when the access token was renewed from the refresh token
+        """
         # jwt verify
         data = self.validate_access_token(access_token)
 
@@ -159,36 +206,42 @@ class EmployeeService:
             refresh_token_db = await self.get_refresh_token(
                 uuid.UUID(refresh.tenant_id), uuid.UUID(refresh.employee_id), db
             )
+            if refresh_token_db is None:
+                logger.debug("refresh token is not available in database")
+                return None
             # validate device
             if refresh_token_db.device_hash != device_hash:
                 logger.debug(
                     "refresh token device and current active device are not matching"
                 )
                 return None
-            # if available
-            if refresh_token_db is not None:
+            # the cached session holds the access token being replaced
+            employee_session_cache.pop(
+                (refresh_token_db.tenant_id, refresh_token_db.employee_id, device_hash)
+            )
+            # create new access token
+            new_access_token_create = await self.create_access_token(
+                refresh_token_db.tenant_id, refresh_token_db.employee_id
+            )
+            if not settings.employee_token_upsert_rotation:
                 # delete access token in database
                 access_token = await self.get_access_token(
                     refresh_token_db.tenant_id, refresh_token_db.employee_id, db
                 )
-                await self.token_repo.delete(db, access_token.id)
-                # create new access token
-                new_access_token_create = await self.create_access_token(
-                    refresh_token_db.tenant_id, refresh_token_db.employee_id
-                )
-                # store token in database
-
-                new_access_token = await self.store_access_token(
-                    new_access_token_create,
-                    refresh_token_db.tenant_id,
-                    refresh_token_db.employee_id,
-                    device_hash,
-                    db,
-                )
-                logger.debug("new access token generated")
-                # set access token in response
-                return new_access_token, True
-            # return Token details
+                if access_token:
+                    await self.token_repo.delete(db, access_token.id)
+            # store token in database, replacing the old access token row
+            new_access_token = await self.store_access_token(
+                new_access_token_create,
+                refresh_token_db.tenant_id,
+                refresh_token_db.employee_id,
+                device_hash,
+                db,
+                replace=settings.employee_token_upsert_rotation,
+            )
+            logger.debug("new access token generated")
+            # set access token in response
+            return new_access_token, new_access_token_create
 
         # on access jwt verified
 
@@ -198,9 +251,49 @@ class EmployeeService:
         )
         if not access_token or access_token.device_hash != device_hash:
             return None
-        return access_token, False
+        return access_token, None
         # return token details
 
+    async def get_employee_session(
+        self, db: AsyncSession, access_token: str, refresh_token: str, device_hash: str
+    ) -> Tuple[Token, Employee | None, str | None] | None:
+        """
+        Validated (access token, employee, new access jwt) of the request.
+        Sessions are cached per device, so a valid access jwt is checked without
+        any database query until the cache entry expires or is invalidated.
+        employee is None when it is missing or deactivated, the new access
+        jwt is None unless the access token was renewed.
+        """
+        data = self.validate_access_token(access_token)
+        if data is not None:
+            session = employee_session_cache.get(
+                (uuid.UUID(data.tenant_id), uuid.UUID(data.employee_id), device_hash)
+            )
+            if session is not None and session.token.token_hash == token_digest(
+                access_token
+            ):
+                return session.token, session.employee, None
+
+        validated = await self.validate_employee_session(
+            db, access_token, refresh_token, device_hash
+        )
+        if validated is None:
+            return None
+        token, new_access = validated
+        employee = await self.employee_repo.get(db, token.tenant_id, token.employee_id)
+        if not employee or not employee.is_active:
+            return token, None, new_access
+
+        # cache copies, the instances stay bound to this request session
+        employee_session_cache.set(
+            (token.tenant_id, token.employee_id, device_hash),
+            EmployeeSession(
+                token=Token.model_validate(token),
+                employee=Employee.model_validate(employee),
+            ),
+        )
+        return token, employee, new_access
+
     async def get_tokens(
         self,
         tenant: uuid.UUID,
@@ -244,16 +337,25 @@ class EmployeeService:
         employee_id: uuid.UUID,
         device_hash: str,
         db: AsyncSession,
-    ) -> str:
+        replace: bool = False,
+    ) -> Token:
+        """
+        replace=True upserts over the existing access token row of the employee
+        in one statement and one commit, used for token rotation
+        """
         new_token = TokenCreate(
             tenant_id=tenant,
             employee_id=employee_id,
             token_type="access_token_employee",
-            token_hash=access,
+            token_hash=token_digest(access),
             device_hash=device_hash,
             expires_at=datetime.now()
             + timedelta(minutes=settings.employee_access_token_expiry_minute),
         )
+        if replace:
+            return await token_repo.upsert(
+                db, new_token, index_elements=("employee_id", "token_type")
+            )
         return await token_repo.create(db, new_token)
 
     #  Store refresh token in database
@@ -269,7 +371,7 @@ class EmployeeService:
             tenant_id=tenant,
             employee_id=employee_id,
             token_type="refresh_token_employee",
-            token_hash=refresh,
+            token_hash=token_digest(refresh),
             device_hash=device_hash,
             expires_at=datetime.now() + timedelta(days=365),
         )
@@ -291,21 +393,65 @@ class EmployeeService:
             db, tenant, employee_id, "refresh_token_employee"
         )
 
+    async def import_employees(
+        self, tenant_id: uuid.UUID, rows: List[Any], db: AsyncSession
+    ) -> dict:
+        """
+        Bulk create tenant employees in one transaction. Rows are validated
+        one by one, invalid rows and duplicate employee_no (in the batch or
+        already stored) are reported per row instead of failing the batch.
+        Valid rows go in chunks of multi-row INSERT .. ON CONFLICT DO NOTHING.
+        """
+        report = [{"row": i, "status": "invalid"} for i in range(len(rows))]
+        valid = {}  # employee_no -> (row index, EmployeeCreate)
+        for i, row in enumerate(rows):
+            try:
+                employee = EmployeeCreate.model_validate(
+                    {
+                        **EmployeeCreateSchema.model_validate(row).model_dump(),
+                        "tenant_id": tenant_id,
+                    }
+                )
+            except ValidationError as e:
+                report[i]["errors"] = [
+                    {"loc": err["loc"], "msg": err["msg"]} for err in e.errors()
+                ]
+                continue
+            report[i]["employee_no"] = employee.employee_no
+            if employee.employee_no in valid:
+                report[i]["status"] = "duplicate"
+                continue
+            valid[employee.employee_no] = (i, employee)
+
+        chunk_rows = settings.employee_import_chunk_rows
+        pending = list(valid.values())
+        for start in range(0, len(pending), chunk_rows):
+            chunk = pending[start : start + chunk_rows]
+            # rows missing from the RETURNING set hit an existing employee_no
+            created = await self.employee_repo.insert_new(db, [e for _, e in chunk])
+            for i, e in chunk:
+                if e.employee_no in created:
+                    report[i].update(status="created", id=created[e.employee_no])
+                else:
+                    report[i]["status"] = "duplicate"
+        await db.commit()
+
+        counts = {"created": 0, "duplicate": 0, "invalid": 0}
+        for row in report:
+            counts[row["status"]] += 1
+        return {**counts, "rows": report}
+
     # 4. Remove (revoke) token (log out or session expire)
     async def clear_session(
         self, tenant: uuid.UUID, employee_id: uuid.UUID, db: AsyncSession
     ):
-        access_token = await self.get_access_token(tenant, employee_id, db)
-
-        refresh_token = await self.get_refresh_token(tenant, employee_id, db)
-
-        if access_token:
-
-            await self.token_repo.delete(db, access_token.id)
-        if refresh_token:
-
-            await self.token_repo.delete(db, refresh_token.id)
-
+        forget_employee_sessions(tenant, employee_id)
+        await self.token_repo.delete_where(
+            db,
+            Token.tenant_id == tenant,
+            Token.employee_id == employee_id,
+            Token.token_type.in_(["access_token_employee", "refresh_token_employee"]),
+        )
         return True
 
     # 4. Remove (revoke) token (log out or session expire)
@@ -324,16 +470,11 @@ class EmployeeService:
     async def mark_attendance_in(
         self, employee: Employee, coordinates: Coordinate, db: AsyncSession
     ) -> Tuple[Attendance, GeoMarking] | Tuple[None, None]:
-        marked_locations = await geomarking_repo.get_all_by_tenant(
-            db, employee.tenant_id
+        nearest, dist = await geomarking_repo.find_nearest(
+            db, employee.tenant_id, coordinates.lat, coordinates.lon
         )
-        nearest, dist = None, 0
-        if marked_locations:
-            nearest, dist = geo.find_nearest(
-                marked_locations,
-                coordinates.model_dump(),
-                location_extract_method=lambda loc: (loc.latitude, loc.longitude),
-            )
+        if nearest is None:
+            dist = 0
         obj_in = AttendanceCreate(
             tenant_id=employee.tenant_id,
             employee_id=employee.id,
@@ -343,28 +484,20 @@ class EmployeeService:
             geo_marking_id=nearest.id if nearest else None,
             distance_from_marking=dist,
         )
-        # verify the last status of attendance
-        _, last_mark = await self.attendance_repo.last_mark_today(
-            db, employee.tenant_id, employee.id
-        )
-        if last_mark and last_mark.status == "IN":
-            return None, None
-        # mark attendance in to table
-        att = Attendance.model_validate(await self.attendance_repo.create(db, obj_in))
+        async with attendance_writer.employee_lock(employee.id):
+            # verify the last status of attendance
+            if await self.last_status(employee, db) == "IN":
+                return None, None
+            # mark attendance in to table and the day summary
+            att = await self.mark(db, obj_in, nearest.name if nearest else None)
         return att, nearest
 
     # 7. Mark attendance "out"
     async def mark_attendance_out(
         self, employee: Employee, coordinates: Coordinate, db: AsyncSession
     ) -> Tuple[Attendance, GeoMarking] | Tuple[None, None]:
-        marked_locations = await geomarking_repo.get_all_by_tenant(
-            db, employee.tenant_id
-        )
-
-        nearest, dist = geo.find_nearest(
-            marked_locations,
-            coordinates.model_dump(),
-            location_extract_method=lambda loc: (loc.latitude, loc.longitude),
+        nearest, dist = await geomarking_repo.find_nearest(
+            db, employee.tenant_id, coordinates.lat, coordinates.lon
         )
         obj_in = AttendanceCreate(
             tenant_id=employee.tenant_id,
@@ -376,20 +509,49 @@ class EmployeeService:
             distance_from_marking=dist,
             status="OUT",
         )
-        # verify the last status of attendance
+        async with attendance_writer.employee_lock(employee.id):
+            # verify the last status of attendance
+            if await self.last_status(employee, db) in (None, "OUT"):
+                return None, None
+            # mark attendance in to table and the day summary
+            att = await self.mark(db, obj_in, nearest.name if nearest else None)
+        return att, nearest
+
+    async def last_status(self, employee: Employee, db: AsyncSession) -> Optional[str]:
+        """
+        status of the last mark of today, marks queued in the writer included,
+        called under attendance_writer.employee_lock
+        """
+        if not attendance_writer.running:
+            _, last_mark = await self.attendance_repo.last_mark_today(
+                db, employee.tenant_id, employee.id
+            )
+            return last_mark.status if last_mark else None
+
+        # a queued mark leaves the pending list only once committed, so taking
+        # the list before a read started after it misses no mark
+        queued = attendance_writer.pending_status(employee.id)
+        await db.commit()
         _, last_mark = await self.attendance_repo.last_mark_today(
             db, employee.tenant_id, employee.id
         )
-        if not last_mark or (last_mark and last_mark.status == "OUT"):
-            return None, None
-        # mark attendance in to table
-        att = Attendance.model_validate(await self.attendance_repo.create(db, obj_in))
-        return att, nearest
+        # end the read transaction so the connection is not held while the
+        # mark waits for its batch, the employee lock keeps a second tap out
+        await db.commit()
+        return queued or (last_mark.status if last_mark else None)
+
+    async def mark(
+        self, db: AsyncSession, obj_in: AttendanceCreate, location: Optional[str]
+    ) -> Attendance:
+        """store the mark, through the group commit writer when it runs"""
+        if not attendance_writer.running:
+            return await self.attendance_repo.mark(db, obj_in, location)
+        return await attendance_writer.submit(obj_in, location)
 
     async def get_state(
         self, tenant_id: uuid.UUID, employee_id: uuid.UUID, db: AsyncSession
-    ):
-
+    ) -> dict:
+        """last and first IN marks of today with their markings, rows as loaded"""
         state_near, state = await self.attendance_repo.last_mark_today(
             db, tenant_id, employee_id
         )
@@ -397,10 +559,10 @@ class EmployeeService:
             db, tenant_id, employee_id
         )
         return {
-            "state": Attendance.model_validate(state).model_dump() if state else {},
-            "state_near": state_near.model_dump() if state_near else None,
-            "today_in_near": today_in_near.model_dump() if today_in_near else None,
-            "today_in": Attendance.model_validate(today_in) if today_in else {},
+            "state": state or {},
+            "state_near": state_near,
+            "today_in_near": today_in_near,
+            "today_in": today_in or {},
         }
 
     async def get_attendance_by_date(
@@ -411,13 +573,7 @@ class EmployeeService:
         end_date: date,
         db: AsyncSession,
     ):
-        client_tz = zoneinfo.ZoneInfo(settings.timezone)
-        start_of_start_date = datetime.combine(
-            start_date, datetime.min.time(), tzinfo=client_tz
-        )
-        end_of_end_date = datetime.combine(
-            end_date, datetime.max.time(), tzinfo=client_tz
-        )
+        start, end = dates.utc_range(start_date, end_date)
 
         query = (
             select(Attendance, Employee, GeoMarking)
@@ -425,8 +581,8 @@ class EmployeeService:
             .join(GeoMarking, Attendance.geo_marking_id == GeoMarking.id)
             .where(Attendance.tenant_id == tenant_id)
             .where(Attendance.employee_id == employee_id)
-            .where(Attendance.timestamp >= start_of_start_date.astimezone(timezone.utc))
-            .where(Attendance.timestamp <= end_of_end_date.astimezone(timezone.utc))
+            .where(Attendance.timestamp >= start)
+            .where(Attendance.timestamp < end)
             .order_by(Attendance.timestamp.desc())
         )
 
@@ -443,6 +599,51 @@ class EmployeeService:
 
         return merged
 
+    def attendance_export(
+        self,
+        tenant_id: uuid.UUID,
+        start_date: date,
+        end_date: date,
+        employee_id: Optional[uuid.UUID] = None,
+    ) -> Tuple[List[str], AsyncIterator[Sequence[Row]]]:
+        """
+        Column names and the flat attendance rows of the range in partitions
+        of settings.export_chunk_rows. Rows are read lazily through a server
+        side cursor on a session of their own, the request session is closed
+        before a streamed body is sent.
+        """
+        start, end = dates.utc_range(start_date, end_date)
+        query = (
+            select(
+                Attendance.timestamp,
+                Attendance.status,
+                Employee.employee_no,
+                Employee.name.label("employee_name"),
+                Attendance.employee_id,
+                GeoMarking.name.label("geomarking_name"),
+                Attendance.distance_from_marking,
+                Attendance.latitude,
+                Attendance.longitude,
+            )
+            .join(Employee, Attendance.employee_id == Employee.id)
+            .outerjoin(GeoMarking, Attendance.geo_marking_id == GeoMarking.id)
+            .where(Attendance.tenant_id == tenant_id)
+            .where(Attendance.timestamp >= start)
+            .where(Attendance.timestamp < end)
+            .order_by(Attendance.timestamp, Attendance.id)
+        )
+        if employee_id is not None:
+            query = query.where(Attendance.employee_id == employee_id)
+        chunk_rows = settings.export_chunk_rows
+
+        async def partitions():
+            async with async_session() as db:
+                result = await db.stream(query.execution_options(yield_per=chunk_rows))
+                async for rows in result.partitions():
+                    yield rows
+
+        return [c.name for c in query.selected_columns], partitions()
+
     async def get_attendance_card(
         self,
         tenant_id: uuid.UUID,
@@ -451,121 +652,48 @@ class EmployeeService:
         end_date: date,
         db: AsyncSession,
     ) -> list:
-        query = text(
-            """
-        WITH first_in_details AS (
-            SELECT DISTINCT ON (a.employee_id, DATE(a.timestamp AT TIME ZONE :timezone))
-                a.employee_id,
-                DATE(a.timestamp AT TIME ZONE :timezone) as attendance_date,
-                a.timestamp as first_in_time,
-                a.distance_from_marking as first_in_distance,
-                l.name as first_in_location
-            FROM attendance a
-            JOIN geomarking l ON a.geo_marking_id = l.id
-            WHERE a.status = 'IN'
-                AND a.tenant_id = :tenant_id
-                AND ( a.employee_id = :employee_id)
-                AND DATE(a.timestamp AT TIME ZONE :timezone) >= :start_date
-                AND DATE(a.timestamp AT TIME ZONE :timezone) <= :end_date
-            ORDER BY
-                a.employee_id,
-                DATE(a.timestamp AT TIME ZONE :timezone),
-                a.timestamp ASC
-        ),
-        last_out_details AS (
-            SELECT DISTINCT ON (a.employee_id, DATE(a.timestamp AT TIME ZONE :timezone))
-                a.employee_id,
-                DATE(a.timestamp AT TIME ZONE :timezone) as attendance_date,
-                a.timestamp as last_out_time,
-                a.distance_from_marking as last_out_distance,
-                l.name as last_out_location
-            FROM attendance a
-            JOIN geomarking l ON a.geo_marking_id = l.id
-            WHERE a.status = 'OUT'
-                AND a.tenant_id = :tenant_id
-                AND ( a.employee_id = :employee_id)
-                AND DATE(a.timestamp AT TIME ZONE :timezone) >= :start_date
-                AND DATE(a.timestamp AT TIME ZONE :timezone) <= :end_date
-            ORDER BY
-                a.employee_id,
-                DATE(a.timestamp AT TIME ZONE :timezone),
-                a.timestamp DESC
-        ),
-        last_entry_details AS (
-            SELECT DISTINCT ON (a.employee_id, DATE(a.timestamp AT TIME ZONE :timezone))
-                a.employee_id,
-                DATE(a.timestamp AT TIME ZONE :timezone) as attendance_date,
-                a.status as last_entry_status
-            FROM attendance a
-            WHERE a.tenant_id = :tenant_id
-                AND ( a.employee_id = :employee_id)
-                AND DATE(a.timestamp AT TIME ZONE :timezone) >= :start_date
-                AND DATE(a.timestamp AT TIME ZONE :timezone) <= :end_date
-            ORDER BY
-                a.employee_id,
-                DATE(a.timestamp AT TIME ZONE :timezone),
-                a.timestamp DESC
-        ),
-        in_counts AS (
-            SELECT
-                employee_id,
-                DATE(timestamp AT TIME ZONE :timezone) as attendance_date,
-                COUNT(*) as total_in_count
-            FROM attendance
-            WHERE status = 'IN'
-                AND tenant_id = :tenant_id
-                AND ( employee_id = :employee_id)
-                AND DATE(timestamp AT TIME ZONE :timezone) >= :start_date
-                AND DATE(timestamp AT TIME ZONE :timezone) <= :end_date
-            GROUP BY employee_id, DATE(timestamp AT TIME ZONE :timezone)
+        days = await attendance_daily_repo.get_range(
+            db, tenant_id, employee_id, start_date, end_date
         )
-        SELECT
-            fi.employee_id,
-            fi.attendance_date,
-            fi.first_in_time,
-            fi.first_in_location,
-            fi.first_in_distance,
-            CASE
-                WHEN le.last_entry_status = 'IN' THEN NULL
-                ELSE lo.last_out_time
-            END as last_out_time,
-            CASE
-                WHEN le.last_entry_status = 'IN' THEN NULL
-                ELSE lo.last_out_location
-            END as last_out_location,
-            CASE
-                WHEN le.last_entry_status = 'IN' THEN NULL
-                ELSE lo.last_out_distance
-            END as last_out_distance,
-            ic.total_in_count,
-            CASE
-                WHEN le.last_entry_status = 'IN' THEN 'INCOMPLETE'
-                ELSE 'COMPLETE'
-            END as day_status
-        FROM first_in_details fi
-        JOIN in_counts ic USING (employee_id, attendance_date)
-        JOIN last_entry_details le USING (employee_id, attendance_date)
-        LEFT JOIN last_out_details lo USING (employee_id, attendance_date)
-        ORDER BY fi.employee_id, fi.attendance_date
+        return [card_day(day) for day in days]
+
+    async def get_tenant_report(
+        self,
+        tenant_id: uuid.UUID,
+        start_date: date,
+        end_date: date,
+        db: AsyncSession,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[dict, Optional[str]]:
+        """
+        Attendance card days of a page of the tenant employees, laid out in
+        columns: days.employee is the index of the day employee in employees.
+        Returns the report and the cursor of the next employee page.
         """
+        page = await attendance_daily_repo.tenant_report(
+            db, tenant_id, start_date, end_date, cursor, limit
         )
-
-        result = (
-            await db.exec(
-                query.params(
-                    timezone=settings.timezone,
-                    tenant_id=tenant_id,
-                    employee_id=employee_id,
-                    start_date=start_date,
-                    end_date=end_date,
-                )
-            )
-        ).all()
-
-        attendance_card = []
-        for row in result:
-            attendance_card.append(dict(row._mapping))
-        return attendance_card
+        employees = {"id": [], "employee_no": [], "name": []}
+        days = {"employee": [], **{k: [] for k in CARD_DAY_COLUMNS}}
+        for employee_id, employee_no, name, day in page.items:
+            if not employees["id"] or employees["id"][-1] != employee_id:
+                employees["id"].append(employee_id)
+                employees["employee_no"].append(employee_no)
+                employees["name"].append(name)
+            if day is None:
+                continue
+            days["employee"].append(len(employees["id"]) - 1)
+            for k, v in card_day(day).items():
+                if k in days:
+                    days[k].append(v)
+        report = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "employees": employees,
+            "days": days,
+        }
+        return report, page.next_cursor
 
     async def get_tenant(self, tenant_id: uuid.UUID, db: AsyncSession) -> Tenant | None:
         """
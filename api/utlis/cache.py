@@ -0,0 +1,88 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# name -> cache, used to expose the counters of every named cache
+caches: Dict[str, "TTLCache"] = {}
+
+
+class TTLCache(Generic[K, V]):
+    """
+    In-process LRU cache where every entry also expires after ttl seconds.
+    Not shared between workers, so writers invalidate their own worker and the
+    ttl bounds how long other workers can serve a stale entry.
+    """
+
+    def __init__(
+        self, maxsize: int = 1024, ttl: Optional[float] = 60, name: str = None
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict[K, Tuple[float, V]] = OrderedDict()
+        if name:
+            caches[name] = self
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K, default: V = None) -> Optional[V]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> V:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else float("inf")
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def pop(self, key: K) -> Optional[V]:
+        "invalidate a single entry"
+        entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+
+    def discard_where(self, predicate: Callable[[K, V], bool]) -> int:
+        "invalidate every entry matching predicate(key, value), return the count"
+        keys = [k for k, (_, v) in self._data.items() if predicate(k, v)]
+        for k in keys:
+            del self._data[k]
+        return len(keys)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+        }
+
+
+def stats() -> Dict[str, dict]:
+    "counters of every named cache"
+    return {name: cache.stats() for name, cache in caches.items()}
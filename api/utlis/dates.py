@@ -0,0 +1,64 @@
+import zoneinfo
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from api.sa.settings import settings
+
+
+def local_today(tz: Optional[str] = None) -> date:
+    "today's calendar date in the tenant timezone (settings.timezone)"
+    return datetime.now(tz=zoneinfo.ZoneInfo(tz or settings.timezone)).date()
+
+
+def utc_range(
+    start_date: date, end_date: Optional[date] = None, tz: Optional[str] = None
+) -> Tuple[datetime, datetime]:
+    """
+    Half-open UTC [start, end) range covering the local calendar days
+    start_date..end_date (both included, end_date defaults to start_date).
+    Filter with timestamp >= start and timestamp < end so an index on the
+    timestamp column can be used.
+    """
+    client_tz = zoneinfo.ZoneInfo(tz or settings.timezone)
+    end_date = end_date or start_date
+    start = datetime.combine(start_date, time.min, tzinfo=client_tz)
+    end = datetime.combine(end_date + timedelta(days=1), time.min, tzinfo=client_tz)
+    return start.astimezone(timezone.utc), end.astimezone(timezone.utc)
+
+
+def local_date(ts: datetime, tz: Optional[str] = None) -> date:
+    "calendar date of the UTC timestamp in the tenant timezone (settings.timezone)"
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(zoneinfo.ZoneInfo(tz or settings.timezone)).date()
+
+
+def utc_offsets(
+    start: datetime, end: datetime, tz: Optional[str] = None
+) -> List[Tuple[datetime, timedelta]]:
+    """
+    UTC offsets of the timezone in effect over [start, end), as a list of
+    (since, offset) with the first since equal to start. Transitions are
+    found to the second by bisecting between daily samples.
+    """
+    client_tz = zoneinfo.ZoneInfo(tz or settings.timezone)
+
+    def offset(ts: datetime) -> timedelta:
+        return ts.astimezone(client_tz).utcoffset()
+
+    offsets = [(start, offset(start))]
+    lo = start
+    while lo < end:
+        hi = min(lo + timedelta(days=1), end)
+        if offset(hi) != offsets[-1][1]:
+            left, right = 0, int((hi - lo).total_seconds())
+            while right - left > 1:
+                mid = (left + right) // 2
+                if offset(lo + timedelta(seconds=mid)) == offsets[-1][1]:
+                    left = mid
+                else:
+                    right = mid
+            since = lo + timedelta(seconds=right)
+            offsets.append((since, offset(since)))
+        lo = hi
+    return offsets
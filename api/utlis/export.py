@@ -0,0 +1,42 @@
+import csv
+import io
+import json
+import uuid
+from datetime import date, datetime, timezone
+from typing import Any, AsyncIterator, Sequence
+
+
+def plain(value: Any) -> Any:
+    "json/csv friendly value, datetimes as UTC ISO 8601"
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).isoformat()
+    if isinstance(value, (date, uuid.UUID)):
+        return str(value)
+    return value
+
+
+async def csv_stream(
+    columns: Sequence[str], partitions: AsyncIterator[Sequence[Sequence]]
+) -> AsyncIterator[str]:
+    """header line, then one chunk of CSV lines per partition of rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    async for rows in partitions:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([plain(v) for v in row] for row in rows)
+        yield buffer.getvalue()
+
+
+async def ndjson_stream(
+    columns: Sequence[str], partitions: AsyncIterator[Sequence[Sequence]]
+) -> AsyncIterator[str]:
+    """one chunk of newline delimited JSON objects per partition of rows"""
+    async for rows in partitions:
+        yield "".join(
+            json.dumps(dict(zip(columns, map(plain, row)))) + "\n" for row in rows
+        )
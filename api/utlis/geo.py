@@ -1,13 +1,31 @@
 import math
-from typing import Callable, Dict, List, Tuple, TypeVar
+from dataclasses import dataclass
+from typing import (
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+try:
+    import numpy as np
+except ImportError:  # the batch distance engine needs the geo extra
+    np = None
 
 T = TypeVar("T")  # Generic type for model
 
+EARTH_RADIUS_KM = 6378  # radius used by haversine_distance_between_points
+
 
 def haversine_distance_between_points(
     lat1: float, lon1: float, lat2: float, lon2: float
 ) -> float:
-    R = 6378  # Radius of the Earth in kilometers
+    R = EARTH_RADIUS_KM  # Radius of the Earth in kilometers
     p1 = math.radians(lat1)
     p2 = math.radians(lat2)
     delta_lambda = math.radians(lon2 - lon1)
@@ -59,3 +77,237 @@ def find_nearest(
             nearest = loc
 
     return nearest, min_dist
+
+
+def to_unit_vector(lat: float, lon: float) -> Tuple[float, float, float]:
+    "Return the (x, y, z) position of a coordinate on the unit sphere"
+    p = math.radians(lat)
+    lam = math.radians(lon)
+    return (math.cos(p) * math.cos(lam), math.cos(p) * math.sin(lam), math.sin(p))
+
+
+class GeoIndex(Generic[T]):
+    """
+    Static k-d tree over unit-sphere coordinates.
+
+    The straight line (chord) distance between two unit vectors grows with the
+    great-circle distance, so the nearest point in 3D space is also the nearest
+    point on the earth and whole branches of the tree can be skipped.
+    Distances returned are computed with haversine_distance_between_points so
+    they are identical to the ones find_nearest produces.
+    """
+
+    __slots__ = ("locations", "_coords", "_root")
+
+    def __init__(
+        self,
+        locations: Sequence[T],
+        location_extract_method: Callable[[T], Tuple[float, float]] = lambda loc: (
+            loc["lat"],
+            loc["lon"],
+        ),
+    ):
+        self.locations = tuple(locations)
+        self._coords = [location_extract_method(loc) for loc in self.locations]
+        points = [(to_unit_vector(*c), i) for i, c in enumerate(self._coords)]
+        self._root = self._build(points, 0)
+
+    def __len__(self) -> int:
+        return len(self.locations)
+
+    @classmethod
+    def _build(cls, points: list, depth: int) -> Optional[tuple]:
+        if not points:
+            return None
+        axis = depth % 3
+        points.sort(key=lambda p: p[0][axis])
+        mid = len(points) // 2
+        point, idx = points[mid]
+        return (
+            point,
+            idx,
+            axis,
+            cls._build(points[:mid], depth + 1),
+            cls._build(points[mid + 1 :], depth + 1),
+        )
+
+    def nearest(
+        self, lat: float, lon: float, max_distance: Optional[float] = None
+    ) -> Tuple[Optional[T], float]:
+        """
+        Return the nearest location and its distance in kilometers.
+        With max_distance (kilometers) only locations within it are considered,
+        (None, inf) is returned when nothing matches or the index is empty.
+        """
+        tx, ty, tz = to_unit_vector(lat, lon)
+        best_d2 = float("inf")
+        if max_distance is not None:
+            chord = 2 * math.sin(min(max_distance / (2 * EARTH_RADIUS_KM), math.pi / 2))
+            # small slack so rounding never drops a point sitting on the radius
+            best_d2 = chord * chord * (1 + 1e-9) + 1e-18
+        best_idx = None
+
+        stack = [(self._root, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if node is None or bound > best_d2:
+                continue
+            (px, py, pz), idx, axis, left, right = node
+            d2 = (px - tx) ** 2 + (py - ty) ** 2 + (pz - tz) ** 2
+            # prefer the earliest location on ties, same as find_nearest
+            if d2 < best_d2 or (
+                d2 == best_d2 and best_idx is not None and idx < best_idx
+            ):
+                best_d2, best_idx = d2, idx
+            diff = (tx, ty, tz)[axis] - (px, py, pz)[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            stack.append((far, diff * diff))
+            stack.append((near, 0.0))
+
+        if best_idx is None:
+            return None, float("inf")
+        dist = haversine_distance_between_points(lat, lon, *self._coords[best_idx])
+        if max_distance is not None and dist > max_distance:
+            return None, float("inf")
+        return self.locations[best_idx], dist
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError(
+            "the batch distance engine needs numpy, install attendanceapp[geo]"
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class PackedCoordinates:
+    """
+    Coordinates packed into flat float64 arrays, with the latitude terms the
+    distance functions need precomputed once instead of per comparison.
+    """
+
+    lat_rad: "np.ndarray"
+    lon: "np.ndarray"
+    sin_lat: "np.ndarray"
+    cos_lat: "np.ndarray"
+
+    @classmethod
+    def pack(
+        cls,
+        locations: Iterable[T],
+        location_extract_method: Callable[[T], Tuple[float, float]] = lambda loc: (
+            loc["lat"],
+            loc["lon"],
+        ),
+    ) -> "PackedCoordinates":
+        _require_numpy()
+        coords = np.array(
+            [location_extract_method(loc) for loc in locations], dtype=np.float64
+        ).reshape(-1, 2)
+        lat_rad = np.radians(coords[:, 0])
+        return cls(
+            lat_rad=lat_rad,
+            lon=coords[:, 1].copy(),
+            sin_lat=np.sin(lat_rad),
+            cos_lat=np.cos(lat_rad),
+        )
+
+    def __len__(self) -> int:
+        return len(self.lat_rad)
+
+
+@dataclass(slots=True, frozen=True)
+class BatchNearest:
+    index: int  # -1 when there is nothing to compare with
+    distance: float
+    distances: "np.ndarray"
+    within: "np.ndarray"  # bool mask, distances within the radius
+
+
+def _reference(lat, lon) -> Tuple["np.ndarray", "np.ndarray"]:
+    "reference latitude in radians and longitude, as a column for many points"
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    if lat.ndim:
+        lat, lon = lat[:, None], lon[:, None]
+    return np.radians(lat), lon
+
+
+def haversine_distances(lat, lon, packed: PackedCoordinates) -> "np.ndarray":
+    """
+    Batch version of haversine_distance_between_points, kilometers from
+    (lat, lon) to every packed coordinate. lat and lon may be arrays of
+    reference points, the result then has one row per reference point.
+    """
+    p1, lon1 = _reference(lat, lon)
+    cos_angle = np.sin(p1) * packed.sin_lat + np.cos(p1) * packed.cos_lat * np.cos(
+        np.radians(packed.lon - lon1)
+    )
+    # rounding can push the same point just past 1, where acos is undefined
+    return np.arccos(np.clip(cos_angle, -1.0, 1.0)) * EARTH_RADIUS_KM
+
+
+def cosine_distances(lat, lon, packed: PackedCoordinates) -> "np.ndarray":
+    "Batch version of cosine_distance_between_points, meters, same shapes"
+    R = 6371000  # Radius of the Earth in meters
+    p1, lon1 = _reference(lat, lon)
+    a = (
+        np.sin((packed.lat_rad - p1) / 2) ** 2
+        + np.cos(p1) * packed.cos_lat * np.sin(np.radians(packed.lon - lon1) / 2) ** 2
+    )
+    return 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a)) * R
+
+
+def _within(distances: "np.ndarray", radius) -> "np.ndarray":
+    if radius is None:
+        return np.ones(distances.shape, dtype=bool)
+    return distances <= np.asarray(radius, dtype=np.float64)
+
+
+def batch_nearest(
+    reference: Dict[str, float],
+    packed: PackedCoordinates,
+    radius: Optional[float | Sequence[float]] = None,
+    df: Callable[..., "np.ndarray"] = haversine_distances,
+) -> BatchNearest:
+    """
+    Distances from reference to every packed coordinate in one pass.
+    radius (one value or one per coordinate, in the unit of df) builds the
+    within mask, without it every coordinate is within.
+    Ties resolve to the first coordinate, same as find_nearest.
+    """
+    _require_numpy()
+    distances = df(reference["lat"], reference["lon"], packed)
+    within = _within(distances, radius)
+    if not len(distances):
+        return BatchNearest(-1, float("inf"), distances, within)
+    index = int(np.argmin(distances))
+    return BatchNearest(index, float(distances[index]), distances, within)
+
+
+def batch_nearest_many(
+    references: Sequence[Dict[str, float]],
+    packed: PackedCoordinates,
+    radius: Optional[float | Sequence[float]] = None,
+    df: Callable[..., "np.ndarray"] = haversine_distances,
+) -> List[BatchNearest]:
+    """
+    batch_nearest for many reference points against the same packed
+    coordinates, all distances computed as one (references x coordinates)
+    matrix.
+    """
+    _require_numpy()
+    lat = np.array([ref["lat"] for ref in references], dtype=np.float64)
+    lon = np.array([ref["lon"] for ref in references], dtype=np.float64)
+    distances = df(lat, lon, packed)
+    within = _within(distances, radius)
+    if not len(packed):
+        return [
+            BatchNearest(-1, float("inf"), row, mask)
+            for row, mask in zip(distances, within)
+        ]
+    indexes = np.argmin(distances, axis=1)
+    return [
+        BatchNearest(int(i), float(row[i]), row, mask)
+        for i, row, mask in zip(indexes, distances, within)
+    ]
@@ -0,0 +1,39 @@
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def adapter(tp: Any) -> TypeAdapter:
+    return TypeAdapter(tp)
+
+
+class ModelResponse(Response):
+    """
+    JSON body rendered by pydantic-core in one pass: content (ORM rows,
+    models, dicts) is validated into tp from attributes and dumped straight to
+    bytes, without FastAPI's jsonable_encoder walk. Headers and cookies set on
+    the request's sub response (response) by dependencies are carried over.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        tp: Any,
+        content: Any,
+        response: Optional[Response] = None,
+        status_code: int = 200,
+    ):
+        self.tp = tp
+        super().__init__(content, status_code=status_code)
+        if response is not None:
+            self.raw_headers.extend(
+                (k, v) for k, v in response.raw_headers if k != b"content-length"
+            )
+
+    def render(self, content: Any) -> bytes:
+        model = adapter(self.tp)
+        return model.dump_json(model.validate_python(content, from_attributes=True))
@@ -0,0 +1,86 @@
+"""
+Scalar find_nearest loop vs the numpy batch distance engine in api.utlis.geo
+
+Times the nearest marking (with the within-radius mask) for one reference
+point, and for --references points at once against the scalar loop run once
+per point. Packing the coordinates is done once, outside the timing, the way
+a cached tenant index would hold them. Needs the geo extra (numpy):
+
+    PYTHONPATH=. python benchmarks/bench_geo.py --sizes 10 1000 100000
+"""
+
+import argparse
+import random
+import timeit
+
+from api.utlis import geo
+
+
+def random_locations(n: int, seed: int = 1):
+    rnd = random.Random(seed)
+    return [{"lat": rnd.uniform(8, 13), "lon": rnd.uniform(74, 78)} for _ in range(n)]
+
+
+def best_us(fn, repeat: int) -> float:
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def bench(size: int, references: int, repeat: int):
+    locations = random_locations(size)
+    reference = {"lat": 10.5, "lon": 76.2}
+    many = random_locations(references, seed=2)
+    packed = geo.PackedCoordinates.pack(locations)
+
+    def scalar():
+        return geo.find_nearest(locations, reference)
+
+    def batch():
+        return geo.batch_nearest(reference, packed, radius=2.0)
+
+    def scalar_many():
+        return [geo.find_nearest(locations, ref) for ref in many]
+
+    def batch_many():
+        return geo.batch_nearest_many(many, packed, radius=2.0)
+
+    nearest, dist = scalar()
+    result = batch()
+    assert locations[result.index] is nearest
+    assert abs(result.distance - dist) <= 1e-9 * max(dist, 1)
+    return {
+        name: best_us(fn, repeat)
+        for name, fn in (
+            ("scalar", scalar),
+            ("batch", batch),
+            ("scalar_many", scalar_many),
+            ("batch_many", batch_many),
+        )
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 100000])
+    parser.add_argument("--references", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'markings':>10} {'scalar us':>12} {'batch us':>12} {'speedup':>8}"
+        f" {'x' + str(args.references) + ' speedup':>14}"
+    )
+    for size in args.sizes:
+        t = bench(size, args.references, args.repeat)
+        print(
+            f"{size:>10} {t['scalar']:>12.1f} {t['batch']:>12.1f}"
+            f" {t['scalar'] / t['batch']:>7.2f}x"
+            f" {t['scalar_many'] / t['batch_many']:>13.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
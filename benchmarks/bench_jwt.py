@@ -0,0 +1,76 @@
+"""
+CPU per request of token validation, plain jwt.decode against the decoded
+token cache (api.sa.utils.decode_token) shared by the auth dependencies
+
+Replays --requests validations spread over --sessions live tokens, half
+employee tokens and half admin tokens (which also base64 decode each claim),
+and prints the cache hit rate and the CPU time saved per request.
+
+    PYTHONPATH=. python benchmarks/bench_jwt.py --sessions 2000 --requests 50000
+"""
+
+import argparse
+import random
+import time
+
+from jose import jwt
+
+from api.sa import utils
+from api.sa.auth import SECRET_KEY, admin_claims
+from api.sa.settings import settings
+
+
+def tokens(sessions: int):
+    """[(token, claims)] half employee, half admin shaped tokens"""
+    out = []
+    for i in range(sessions):
+        exp = time.time() + 3600
+        if i % 2:
+            payload = {"employee_id": str(i), "level_": "EMPLOYEE", "UA": "x" * 64}
+            out.append((jwt.encode({**payload, "exp": exp}, SECRET_KEY), None))
+        else:
+            payload = {"id": "MQ==0", "tenant_id": "MQ==0", "UA": "eA==0"}
+            out.append((jwt.encode({**payload, "exp": exp}, SECRET_KEY), admin_claims))
+    return out
+
+
+def uncached(token: str, claims):
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[utils.ALGORITHM])
+    return claims(payload) if claims else payload
+
+
+def cpu_us(validate, requests) -> float:
+    start = time.process_time()
+    for token, claims in requests:
+        validate(token, claims)
+    return (time.process_time() - start) / len(requests) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=50000)
+    args = parser.parse_args()
+
+    live = tokens(args.sessions)
+    rnd = random.Random(7)
+    # a few busy sessions and a long tail, like a shift of employees
+    requests = rnd.choices(
+        live, weights=[1 / (i + 1) for i in range(len(live))], k=args.requests
+    )
+
+    utils.token_cache.clear()
+    utils.token_cache.hits = utils.token_cache.misses = 0
+    before = cpu_us(uncached, requests)
+    after = cpu_us(utils.decode_token, requests)
+    stats = utils.token_cache.stats()
+
+    print(f"cache size {settings.jwt_cache_size}, ttl {settings.jwt_cache_ttl_second}s")
+    print(f"hit rate          {stats['hit_rate']:.1%}")
+    print(f"jwt.decode        {before:8.1f} us/request")
+    print(f"decode_token      {after:8.1f} us/request")
+    print(f"saved             {before - after:8.1f} us/request")
+
+
+if __name__ == "__main__":
+    main()
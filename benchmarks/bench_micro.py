@@ -0,0 +1,223 @@
+"""
+Micro benchmarks of the hot helpers, checked against a stored baseline
+
+Times geo.find_nearest over 10/1k/100k markings, the employee token helpers
+(create_token, validate_token), the admin token helpers
+(create_admin_access_token, validate_admin with its per claim base64),
+device_hash/is_mobile and verify_password. validate_* run both with the
+decoded token cache cleared (cold) and hit (cached).
+
+Each case reports the best time per call in microseconds. A case slower than
+its baseline by more than --threshold (a fraction, default the one stored in
+the baseline) and by more than NOISE_US is a regression, and the exit status
+is 1. Baselines depend on the machine, so save them again after changing
+machines, or after a change that is meant to move the numbers:
+
+    PYTHONPATH=. python benchmarks/bench_micro.py
+    PYTHONPATH=. python benchmarks/bench_micro.py --only token --threshold 0.5
+    PYTHONPATH=. python benchmarks/bench_micro.py --save
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import timeit
+from typing import Callable, Dict, List, Tuple
+
+from starlette.requests import Request
+
+from api.sa import auth, utils
+from api.utlis import geo
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+# slowdowns below this are timer and interpreter jitter, whatever the ratio
+NOISE_US = 1.0
+
+PHONE = b"Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) Mobile/15E148"
+
+
+def request(user_agent: bytes = PHONE) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [(b"user-agent", user_agent)],
+            "client": ("10.0.0.1", 40000),
+        }
+    )
+
+
+def run(coro):
+    """result of a coroutine that never suspends (the auth dependencies)"""
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return done.value
+    raise RuntimeError("coroutine suspended")
+
+
+def geo_cases() -> List[Tuple[str, Callable]]:
+    rnd = random.Random(1)
+    reference = {"lat": 10.5, "lon": 76.2}
+    cases = []
+    for size in (10, 1000, 100_000):
+        locations = [
+            {"lat": rnd.uniform(8, 13), "lon": rnd.uniform(74, 78)} for _ in range(size)
+        ]
+        cases.append(
+            (
+                f"geo.find_nearest[{size}]",
+                lambda locations=locations: geo.find_nearest(locations, reference),
+            )
+        )
+    return cases
+
+
+def token_cases() -> List[Tuple[str, Callable]]:
+    payload = {"employee_id": "7", "tenant_id": "3", "level_": "EMPLOYEE"}
+    token = utils.create_token(payload, expire_second=3600)
+
+    def validate_cold():
+        utils.token_cache.clear()
+        return utils.validate_token(token)
+
+    return [
+        ("create_token", lambda: utils.create_token(payload, expire_second=3600)),
+        ("validate_token[cold]", validate_cold),
+        ("validate_token[cached]", lambda: utils.validate_token(token)),
+    ]
+
+
+def admin_cases() -> List[Tuple[str, Callable]]:
+    req = request(b"Mozilla/5.0 (X11; Linux x86_64)")
+
+    def create():
+        data = {"id": "9", "tenant_id": "3", "email": "admin@example.com"}
+        return auth.create_admin_access_token(req, data, expire_second=3600)
+
+    token = create()
+
+    def validate_cold():
+        utils.token_cache.clear()
+        return run(auth.validate_admin(req, token))
+
+    return [
+        ("create_admin_access_token", create),
+        ("validate_admin[cold]", validate_cold),
+        ("validate_admin[cached]", lambda: run(auth.validate_admin(req, token))),
+    ]
+
+
+def request_cases() -> List[Tuple[str, Callable]]:
+    req = request()
+    return [
+        ("device_hash", lambda: utils.device_hash(req)),
+        ("is_mobile", lambda: utils.is_mobile(req)),
+    ]
+
+
+def password_cases() -> List[Tuple[str, Callable]]:
+    hashed = auth.get_password_hash("benchmark-password")
+    return [
+        ("verify_password", lambda: auth.verify_password("benchmark-password", hashed))
+    ]
+
+
+def cases() -> List[Tuple[str, Callable]]:
+    return [
+        *geo_cases(),
+        *token_cases(),
+        *admin_cases(),
+        *request_cases(),
+        *password_cases(),
+    ]
+
+
+def best_us(fn: Callable, repeat: int) -> float:
+    """best microseconds per call, each repeat running for about 0.2s"""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def load_baseline(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--only", help="run the cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument(
+        "--threshold", type=float, help="allowed slowdown, 0.25 is 25 percent"
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="store the results as the baseline"
+    )
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    threshold = args.threshold
+    if threshold is None:
+        threshold = baseline.get("threshold", DEFAULT_THRESHOLD)
+    stored: Dict[str, float] = baseline.get("results", {})
+
+    results: Dict[str, float] = {}
+    regressions = []
+    print(f"{'case':<32} {'us':>12} {'baseline':>12} {'change':>8}")
+    for name, fn in cases():
+        if args.only and args.only not in name:
+            continue
+        us = results[name] = round(best_us(fn, args.repeat), 3)
+        before = stored.get(name)
+        if before is None:
+            print(f"{name:<32} {us:>12.2f} {'-':>12} {'':>8}")
+            continue
+        change = us / before - 1
+        regressed = change > threshold and us - before > NOISE_US
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name:<32} {us:>12.2f} {before:>12.2f} {change:>+7.0%}"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+        "threshold": threshold,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save:
+        # keep the stored cases that were not run (--only)
+        report["results"] = {**stored, **results}
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"\nsaved {args.baseline}")
+    elif regressions:
+        print(
+            f"\n{len(regressions)} regressed over {threshold:.0%}: "
+            + ", ".join(regressions)
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+pbkdf2_sha256 cost per rounds, to choose settings.password_hash_rounds
+
+    PYTHONPATH=. python benchmarks/bench_password.py --target-ms 50
+"""
+
+import argparse
+import time
+
+from passlib.hash import pbkdf2_sha256
+
+
+def verify_ms(rounds: int, repeat: int) -> float:
+    hasher = pbkdf2_sha256.using(rounds=rounds)
+    hashed = hasher.hash("benchmark-password")
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        hasher.verify("benchmark-password", hashed)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        nargs="+",
+        default=[10_000, 29_000, 100_000, 300_000, 600_000],
+    )
+    parser.add_argument("--target-ms", type=float, default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rounds':>10} {'verify ms':>10}")
+    per_round = []
+    for rounds in args.rounds:
+        ms = verify_ms(rounds, args.repeat)
+        per_round.append(ms / rounds)
+        print(f"{rounds:>10} {ms:>10.2f}")
+
+    if args.target_ms:
+        rounds = int(args.target_ms / min(per_round))
+        print(f"\nPASSWORD_HASH_ROUNDS={rounds}  # ~{args.target_ms:g} ms per login")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Response serialization cost per hot route, previous path against ModelResponse
+
+The previous path is what the handlers did before: model_validate/model_dump
+of the rows, FastAPI's jsonable_encoder walk and JSONResponse rendering. The
+new path validates the loaded rows into the route response model and dumps
+them to bytes with pydantic-core in one pass. Rows are built in memory, so
+only serialization is measured.
+
+    PYTHONPATH=. python benchmarks/bench_serialization.py --rows 500
+"""
+
+import argparse
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from api.models import (
+    Attendance,
+    AttendanceDaily,
+    Employee,
+    EmployeeRead,
+    GeoMarking,
+)
+from api.schema.response import (
+    AttendanceCardDay,
+    EmployeeState,
+    EmployeeStatus,
+    MarkResponse,
+)
+from api.services.employee_service import card_day
+from api.utlis.response import ModelResponse
+
+
+def rows(n: int):
+    tenant_id = uuid.uuid4()
+    marking = GeoMarking(name="HQ", latitude=10, longitude=76, tenant_id=tenant_id)
+    employees = [
+        Employee(employee_no=f"E{i}", name=f"employee {i}", tenant_id=tenant_id)
+        for i in range(n)
+    ]
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    mark = Attendance(
+        tenant_id=tenant_id,
+        employee_id=employees[0].id,
+        timestamp=now,
+        latitude=10.0,
+        longitude=76.0,
+        geo_marking_id=marking.id,
+        distance_from_marking=0.4,
+    )
+    days = [
+        AttendanceDaily(
+            tenant_id=tenant_id,
+            employee_id=employees[0].id,
+            local_date=date(2025, 8, 1) + timedelta(days=d),
+            first_in_time=now,
+            first_in_location="HQ",
+            first_in_distance=0.4,
+            last_out_time=now,
+            last_out_location="HQ",
+            last_out_distance=0.2,
+            last_status="OUT",
+            total_in_count=2,
+            updated_at=now,
+        )
+        for d in range(31)
+    ]
+    return marking, employees, mark, days
+
+
+def cases(n: int):
+    marking, employees, mark, days = rows(n)
+    status = [
+        {**dict(e), "last_marked_today": "IN", "device_locked": True} for e in employees
+    ]
+    state = dict(state=mark, state_near=marking, today_in_near=marking, today_in=mark)
+    employee = employees[0]
+    return [
+        (
+            "/admin/tenant/employees",
+            lambda: JSONResponse(jsonable_encoder(employees)),
+            lambda: ModelResponse(List[EmployeeRead], employees),
+        ),
+        (
+            "/admin/tenant/employees/status",
+            lambda: JSONResponse(
+                jsonable_encoder(
+                    [
+                        {
+                            **e.model_dump(),
+                            "last_marked_today": "IN",
+                            "device_locked": True,
+                        }
+                        for e in employees
+                    ]
+                )
+            ),
+            lambda: ModelResponse(List[EmployeeStatus], status),
+        ),
+        (
+            "/employee/attendance_card",
+            lambda: JSONResponse(
+                jsonable_encoder(
+                    [card_day(AttendanceDaily.model_validate(d)) for d in days]
+                )
+            ),
+            lambda: ModelResponse(List[AttendanceCardDay], [card_day(d) for d in days]),
+        ),
+        (
+            "/employee/me",
+            lambda: JSONResponse(
+                jsonable_encoder(
+                    {
+                        **employee.model_dump(),
+                        "state": Attendance.model_validate(mark).model_dump(),
+                        "state_near": marking.model_dump(),
+                        "today_in_near": marking.model_dump(),
+                        "today_in": Attendance.model_validate(mark),
+                    }
+                )
+            ),
+            lambda: ModelResponse(EmployeeState, {**dict(employee), **state}),
+        ),
+        (
+            "/employee/markin",
+            lambda: JSONResponse(
+                jsonable_encoder(
+                    {**Attendance.model_validate(mark).model_dump(), "place": "HQ"}
+                )
+            ),
+            lambda: ModelResponse(MarkResponse, {**dict(mark), "place": "HQ"}),
+        ),
+    ]
+
+
+def best_us(run, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500, help="employees per page")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'route':<32} {'before us':>10} {'after us':>10} {'speedup':>8}")
+    for route, before, after in cases(args.rows):
+        assert len(after().body) > 0
+        b, a = best_us(before, args.repeat), best_us(after, args.repeat)
+        print(f"{route:<32} {b:>10.0f} {a:>10.0f} {b / a:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Print the EXPLAIN plan of the hot repo queries against settings.db_url
+
+The queries are captured while calling the repo methods, so the plans match
+what the app sends. Run before and after `alembic upgrade head` on a seeded
+database and compare the two outputs:
+
+    PYTHONPATH=. python benchmarks/explain_queries.py --output before.txt
+    alembic upgrade head
+    PYTHONPATH=. python benchmarks/explain_queries.py --output after.txt
+    diff before.txt after.txt
+
+attendance_daily_repo.get_range is only captured once the attendance_daily
+table exists, that is after the upgrade, so it shows up as added in the diff.
+"""
+
+import argparse
+import asyncio
+from datetime import date
+
+from sqlalchemy import event, inspect
+from sqlmodel import select
+
+from api.models import AttendanceDaily, Employee, Token, User
+from api.sa.db import async_session, engine
+from api.services.cruds.tenant import (
+    attendance_daily_repo,
+    attendance_repo,
+    employee_repo,
+    geomarking_repo,
+    token_repo,
+    user_repo,
+)
+
+
+async def capture(db):
+    """call the repo methods of the hot paths, return [(name, statement, params)]"""
+    employee = (await db.exec(select(Employee).limit(1))).first()
+    user = (await db.exec(select(User).limit(1))).first()
+    token = (await db.exec(select(Token).limit(1))).first()
+    if employee is None:
+        raise SystemExit("database has no employee, seed it first")
+    tenant_id, employee_id = employee.tenant_id, employee.id
+
+    calls = [
+        ("employee_repo.get", employee_repo.get(db, tenant_id, employee_id)),
+        ("employee_repo.get_all", employee_repo.get_all(db, tenant_id)),
+        (
+            "employee_repo.get_employee_status",
+            employee_repo.get_employee_status(db, tenant_id),
+        ),
+        (
+            "token_repo.get_token_by",
+            token_repo.get_token_by(
+                db, tenant_id, employee_id, "access_token_employee"
+            ),
+        ),
+        (
+            "token_repo.get_token_token",
+            token_repo.get_token_token(db, token.token_hash if token else ""),
+        ),
+        (
+            "geomarking_repo.get_all_by_tenant",
+            geomarking_repo.get_all_by_tenant(db, tenant_id),
+        ),
+        (
+            "attendance_repo.last_mark_today",
+            attendance_repo.last_mark_today(db, tenant_id, employee_id),
+        ),
+        (
+            "attendance_repo.today_in",
+            attendance_repo.today_in(db, tenant_id, employee_id),
+        ),
+        (
+            "attendance_repo.get_today",
+            attendance_repo.get_today(db, tenant_id, employee_id),
+        ),
+        (
+            "attendance_repo.get_by_date",
+            attendance_repo.get_by_date(db, tenant_id, employee_id, date.today()),
+        ),
+        (
+            "user_repo.get_user_by_email",
+            user_repo.get_user_by_email(db, user.email if user else ""),
+        ),
+    ]
+    if await db.run_sync(
+        lambda session: inspect(session.connection()).has_table(
+            AttendanceDaily.__tablename__
+        )
+    ):
+        calls.append(
+            (
+                "attendance_daily_repo.get_range",
+                attendance_daily_repo.get_range(
+                    db,
+                    tenant_id,
+                    employee_id,
+                    date.today().replace(day=1),
+                    date.today(),
+                ),
+            )
+        )
+    geomarking_repo.cache.clear()
+
+    captured = []
+    current = {"name": None}
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        captured.append((current["name"], statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        for name, call in calls:
+            current["name"] = name
+            await call
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+async def explain(analyze: bool) -> str:
+    dialect = engine.dialect.name
+    if dialect == "postgresql":
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+    else:
+        prefix = "EXPLAIN QUERY PLAN "
+
+    async with async_session() as db:
+        captured = await capture(db)
+
+    out = []
+    async with engine.connect() as conn:
+        for name, statement, parameters in captured:
+            rows = (await conn.exec_driver_sql(prefix + statement, parameters)).all()
+            plan = [" | ".join(str(v) for v in row) for row in rows]
+            out.append(f"== {name}\n{statement.strip()}\n\n" + "\n".join(plan) + "\n")
+    return "\n".join(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--analyze", action="store_true", help="postgres only")
+    parser.add_argument("--output", help="also write the plans to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(explain(args.analyze))
+    print(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,9 @@ import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from api.main import app as fastapi_app
 
@@ -21,3 +24,19 @@ async def async_client():
         base_url="http://test",
     ) as ac:
         yield ac
+
+
+# In-memory sqlite database with every table, new for each test
+@pytest_asyncio.fixture
+async def db_engine():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db(db_engine):
+    async with AsyncSession(db_engine, expire_on_commit=False) as session:
+        yield session
@@ -0,0 +1,40 @@
+import pytest
+from fastapi import HTTPException
+
+from api.models import Tenant, User
+from api.sa.depend import get_admin
+from api.services.cruds.tenant import admin_cache, tenant_repo, user_repo
+
+
+@pytest.mark.asyncio
+async def test_get_admin_cache_and_invalidation(monkeypatch, db):
+    admin_cache.clear()
+
+    lookups = []
+    get = user_repo.get
+
+    async def counted_get(db, id):
+        lookups.append(id)
+        return await get(db, id)
+
+    monkeypatch.setattr(user_repo, "get", counted_get)
+
+    tenant = Tenant(name="t", icon="i")
+    user = User(tenant_id=tenant.id, email="a@x", password_hash="h")
+    db.add_all([tenant, user])
+    await db.commit()
+    token = {"id": str(user.id), "tenant_id": str(tenant.id)}
+
+    assert (await get_admin(None, token, db)).id == user.id
+    assert (await get_admin(None, token, db)).id == user.id
+    assert len(lookups) == 1
+
+    await user_repo.deactivate(db, user.id)
+    with pytest.raises(HTTPException):
+        await get_admin(None, token, db)
+    await user_repo.activate(db, user.id)
+    await get_admin(None, token, db)
+    assert len(lookups) == 3 and len(admin_cache) == 1
+
+    await tenant_repo.deactivate(db, tenant.id)
+    assert len(admin_cache) == 0
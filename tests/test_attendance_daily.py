@@ -0,0 +1,130 @@
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlmodel import select
+
+from api.models import AttendanceCreate, AttendanceDaily, Employee, GeoMarking, Tenant
+from api.sa.settings import settings
+from api.services.cruds.tenant import attendance_daily_repo, attendance_repo
+from api.services.employee_service import employee_service
+
+# (utc timestamp, status, geomarking), Europe/London moves to BST on 2025-03-30
+MARKS = [
+    (datetime(2025, 3, 29, 8, 0), "IN", "HQ"),
+    (datetime(2025, 3, 29, 12, 0), "OUT", "HQ"),
+    (datetime(2025, 3, 29, 13, 0), "IN", "B"),
+    (datetime(2025, 3, 29, 23, 30), "OUT", "B"),
+    (datetime(2025, 3, 30, 9, 0), "IN", "B"),
+    (datetime(2025, 3, 30, 23, 30), "IN", "HQ"),
+    (datetime(2025, 3, 31, 6, 0), "OUT", "HQ"),
+    (datetime(2025, 3, 31, 7, 0), "IN", "HQ"),
+]
+
+
+@pytest.mark.asyncio
+async def test_daily_summary_matches_incremental_rows(monkeypatch, db):
+    monkeypatch.setattr(settings, "timezone", "Europe/London")
+    tenant = Tenant(name="t", icon="i")
+    employee = Employee(employee_no="E1", name="e", tenant_id=tenant.id)
+    markings = {
+        name: GeoMarking(name=name, latitude=10.0, longitude=76.0, tenant_id=tenant.id)
+        for name in ("HQ", "B")
+    }
+    db.add_all([tenant, employee, *markings.values()])
+    await db.commit()
+
+    for i, (ts, status, name) in enumerate(MARKS):
+        obj_in = AttendanceCreate(
+            tenant_id=tenant.id,
+            employee_id=employee.id,
+            timestamp=ts.replace(tzinfo=timezone.utc),
+            latitude=10.0,
+            longitude=76.0,
+            geo_marking_id=markings[name].id,
+            distance_from_marking=float(i),
+            status=status,
+        )
+        await attendance_repo.mark(db, obj_in, name)
+
+    stored = (
+        await db.exec(select(AttendanceDaily).order_by(AttendanceDaily.local_date))
+    ).all()
+    summary = await db.exec(
+        attendance_repo.daily_summary(
+            db, date(2025, 3, 29), date(2025, 3, 31), tenant_id=tenant.id
+        )
+    )
+    computed = [AttendanceDaily.model_validate(dict(r._mapping)) for r in summary]
+
+    assert [d.local_date.day for d in computed] == [29, 30, 31]
+    assert [d.total_in_count for d in computed] == [2, 1, 2]
+    assert [AttendanceDaily.model_validate(d).model_dump() for d in stored] == [
+        d.model_dump() for d in computed
+    ]
+
+    assert await attendance_daily_repo.rebuild(db, tenant_id=tenant.id) == 3
+
+
+@pytest.mark.asyncio
+async def test_tenant_report_pages_employees_with_their_days(db):
+    tenant, other = Tenant(name="t", icon="i"), Tenant(name="o", icon="i")
+    created = datetime(2025, 8, 1)
+    staff = [
+        Employee(
+            employee_no=f"E{i}",
+            name=f"e{i}",
+            tenant_id=tenant.id,
+            created_at=created + timedelta(minutes=i),
+        )
+        for i in range(3)
+    ]
+    stranger = Employee(employee_no="X", name="x", tenant_id=other.id)
+
+    def day(employee, month, d, first_in=True):
+        return AttendanceDaily(
+            tenant_id=employee.tenant_id,
+            employee_id=employee.id,
+            local_date=date(2025, month, d),
+            first_in_time=datetime(2025, month, d, 4) if first_in else None,
+            last_status="IN",
+            total_in_count=1,
+            updated_at=created,
+        )
+
+    # E1 has no day in the range, the range is 1 - 5 August
+    db.add_all([tenant, other, *staff, stranger])
+    db.add_all(
+        [
+            day(staff[0], 8, 2),
+            day(staff[0], 8, 1),
+            day(staff[0], 8, 10),
+            day(staff[1], 7, 31),
+            day(staff[1], 8, 4, first_in=False),
+            day(staff[2], 8, 3),
+            day(stranger, 8, 2),
+        ]
+    )
+    await db.commit()
+
+    def rows(page):
+        return [(no, d and d.local_date.day) for _, no, _, d in page.items]
+
+    start, end = date(2025, 8, 1), date(2025, 8, 5)
+    first = await attendance_daily_repo.tenant_report(
+        db, tenant.id, start, end, limit=2
+    )
+    assert rows(first) == [("E0", 1), ("E0", 2), ("E1", None)]
+    second = await attendance_daily_repo.tenant_report(
+        db, tenant.id, start, end, cursor=first.next_cursor, limit=2
+    )
+    assert rows(second) == [("E2", 3)]
+    assert second.next_cursor is None
+
+    report, cursor = await employee_service.get_tenant_report(
+        tenant.id, start, end, db, limit=2
+    )
+    assert report["employees"]["employee_no"] == ["E0", "E1"]
+    assert report["days"]["employee"] == [0, 0]
+    assert report["days"]["day_status"] == ["INCOMPLETE", "INCOMPLETE"]
+    assert cursor == first.next_cursor
@@ -0,0 +1,142 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from api.models import (
+    Attendance,
+    AttendanceCreate,
+    AttendanceDaily,
+    Employee,
+    GeoMarking,
+    Tenant,
+)
+from api.schema.general import Coordinate
+from api.services import employee_service as employee_service_module
+from api.services.attendance_writer import AttendanceWriter
+from api.services.cruds.tenant import attendance_repo
+from api.services.employee_service import employee_service
+
+
+async def seed(engine, employees: int):
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as db:
+        tenant = Tenant(name="t", icon="i")
+        marking = GeoMarking(name="HQ", latitude=10, longitude=76, tenant_id=tenant.id)
+        staff = [
+            Employee(employee_no=f"E{i}", name="e", tenant_id=tenant.id)
+            for i in range(employees)
+        ]
+        db.add_all([tenant, marking, *staff])
+        await db.commit()
+    return factory, marking, staff
+
+
+def mark(employee, marking, ts, status):
+    return AttendanceCreate(
+        tenant_id=employee.tenant_id,
+        employee_id=employee.id,
+        timestamp=ts,
+        latitude=10.0,
+        longitude=76.0,
+        geo_marking_id=marking.id,
+        distance_from_marking=0.0,
+        status=status,
+    )
+
+
+@pytest.mark.asyncio
+async def test_marks_share_one_commit_and_keep_order(db_engine):
+    factory, marking, staff = await seed(db_engine, 20)
+    writer = AttendanceWriter(max_rows=100, max_delay_ms=50, session_factory=factory)
+    await writer.start()
+    ts = datetime(2025, 8, 4, 4, 0, tzinfo=timezone.utc)
+    marks = [mark(e, marking, ts, "IN") for e in staff]
+    marks += [mark(e, marking, ts + timedelta(seconds=1), "OUT") for e in staff]
+    submits = [asyncio.ensure_future(writer.submit(m, "HQ")) for m in marks]
+    await asyncio.sleep(0)
+    assert writer.pending_status(staff[0].id) == "OUT"
+    stored = await asyncio.gather(*submits)
+    await writer.stop()
+
+    assert writer.batches == 1 and writer.rows == 40
+    assert [a.status for a in stored] == [m.status for m in marks]
+    assert writer.pending_status(staff[0].id) is None
+    async with factory() as db:
+        days = (await db.exec(select(AttendanceDaily))).all()
+    assert len(days) == 20
+    assert all(d.last_status == "OUT" and d.total_in_count == 1 for d in days)
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried_per_mark(monkeypatch, db_engine):
+    factory, marking, staff = await seed(db_engine, 3)
+
+    async def broken(*args, **kwargs):
+        raise RuntimeError("batch insert failed")
+
+    monkeypatch.setattr(attendance_repo, "create_many", broken)
+    writer = AttendanceWriter(max_rows=10, max_delay_ms=10, session_factory=factory)
+    await writer.start()
+    ts = datetime(2025, 8, 4, 4, 0, tzinfo=timezone.utc)
+    await asyncio.gather(
+        *(writer.submit(mark(e, marking, ts, "IN"), "HQ") for e in staff)
+    )
+    await writer.stop()
+
+    assert writer.batches == 0 and writer.retried == 3
+    async with factory() as db:
+        count = (await db.exec(select(func.count()).select_from(Attendance))).one()
+    assert count == 3
+
+
+@pytest.mark.asyncio
+async def test_last_status_sees_mark_committed_during_its_read(monkeypatch, db_engine):
+    factory, marking, staff = await seed(db_engine, 1)
+    employee = staff[0]
+    writer = AttendanceWriter(max_rows=10, max_delay_ms=50, session_factory=factory)
+    monkeypatch.setattr(employee_service_module, "attendance_writer", writer)
+    await writer.start()
+
+    now = datetime.now(timezone.utc)
+    queued = asyncio.ensure_future(
+        writer.submit(mark(employee, marking, now, "IN"), "HQ")
+    )
+    await asyncio.sleep(0)
+    last_mark_today = attendance_repo.last_mark_today
+
+    async def read_then_flush(db, tenant_id, employee_id):
+        # the read misses the mark, which is committed before the read returns
+        result = await last_mark_today(db, tenant_id, employee_id)
+        await queued
+        return result
+
+    monkeypatch.setattr(attendance_repo, "last_mark_today", read_then_flush)
+    async with factory() as db:
+        assert await employee_service.last_status(employee, db) == "IN"
+    assert writer.pending_status(employee.id) is None
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_double_tap_marks_in_once(monkeypatch, db_engine):
+    factory, marking, staff = await seed(db_engine, 1)
+    writer = AttendanceWriter(max_rows=10, max_delay_ms=5, session_factory=factory)
+    monkeypatch.setattr(employee_service_module, "attendance_writer", writer)
+    await writer.start()
+
+    here = Coordinate(lat=10.0, lon=76.0)
+    async with factory() as first, factory() as second:
+        taps = await asyncio.gather(
+            employee_service.mark_attendance_in(staff[0], here, first),
+            employee_service.mark_attendance_in(staff[0], here, second),
+        )
+    await writer.stop()
+
+    assert sorted(att is None for att, _ in taps) == [False, True]
+    async with factory() as db:
+        count = (await db.exec(select(func.count()).select_from(Attendance))).one()
+    assert count == 1
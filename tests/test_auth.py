@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+import pytest
+from jose.exceptions import ExpiredSignatureError
+from passlib.hash import pbkdf2_sha256
+from sqlmodel import select
+
+from api.models import Employee, Tenant, Token
+from api.sa import auth, utils
+from api.services.cruds.tenant import token_repo
+from api.services.employee_service import employee_service
+
+
+@pytest.mark.asyncio
+async def test_password_service_hash_and_verify():
+    service = auth.PasswordService(workers=1, queue_limit=1)
+    hashed = await service.hash("secret")
+
+    assert await service.verify("secret", hashed)
+    assert not await service.verify("wrong", hashed)
+    assert await service.verify_and_update("secret", hashed) == (True, None)
+
+
+@pytest.mark.asyncio
+async def test_password_service_rehash_other_rounds(monkeypatch):
+    monkeypatch.setattr(auth, "PASSWORD_HASHER", pbkdf2_sha256.using(rounds=2000))
+    service = auth.PasswordService(workers=1, queue_limit=1)
+    hashed = pbkdf2_sha256.using(rounds=1000).hash("secret")
+
+    valid, new_hash = await service.verify_and_update("secret", hashed)
+    assert valid and new_hash.startswith("$pbkdf2-sha256$2000$")
+    assert await service.verify_and_update("secret", new_hash) == (True, None)
+
+
+@pytest.mark.asyncio
+async def test_password_service_queue_limit():
+    service = auth.PasswordService(workers=1, queue_limit=0)
+    results = await asyncio.gather(
+        service.hash("a"), service.hash("b"), return_exceptions=True
+    )
+    assert isinstance(results[1], auth.PasswordQueueFull)
+
+
+def test_decode_token_cache_honours_exp(monkeypatch):
+    utils.token_cache.clear()
+    token = utils.create_token({"id": "1"}, expire_second=60)
+    hits = utils.token_cache.hits
+
+    assert utils.decode_token(token) == {
+        "id": "1",
+        "exp": pytest.approx(time.time() + 60, abs=5),
+    }
+    assert utils.decode_token(token) is utils.decode_token(token)
+    assert utils.token_cache.hits == hits + 2
+
+    now = time.time()
+    monkeypatch.setattr(utils.time, "time", lambda: now + 61)
+    with pytest.raises(ExpiredSignatureError):
+        utils.decode_token(token)
+    assert len(utils.token_cache) == 0
+
+
+def test_decode_token_caches_admin_claims_apart():
+    utils.token_cache.clear()
+    token = auth.jwt.encode(
+        {"id": "MQ==0", "level_": "QURNSU4=0"}, auth.SECRET_KEY, algorithm="HS256"
+    )
+
+    assert utils.decode_token(token, auth.admin_claims) == {
+        "id": "1",
+        "level_": "ADMIN",
+    }
+    assert utils.decode_token(token)["level_"] == "QURNSU4=0"
+    assert len(utils.token_cache) == 2
+
+
+def test_token_digest_is_fixed_length():
+    token = utils.create_token({"id": "1", "purpose": "auth"}, expire_second=60)
+
+    assert len(utils.token_digest(token)) == 64
+    assert utils.token_digest(token) == utils.token_digest(token)
+    assert utils.token_digest(token) != utils.token_digest(token + "x")
+
+
+@pytest.mark.asyncio
+async def test_access_token_stored_as_digest(db):
+    tenant = Tenant(name="t", icon="i")
+    employee = Employee(employee_no="E1", name="e", tenant_id=tenant.id)
+    db.add_all([tenant, employee])
+    await db.commit()
+    access = await employee_service.create_access_token(tenant.id, employee.id)
+
+    stored = await employee_service.store_access_token(
+        access, tenant.id, employee.id, "device", db
+    )
+    assert stored.token_hash == utils.token_digest(access)
+    hashes = (await db.exec(select(Token.token_hash))).all()
+    assert hashes == [utils.token_digest(access)] and access not in hashes
+
+    assert (await token_repo.get_token_token(db, access)).id == stored.id
+    assert await token_repo.get_token_token(db, stored.token_hash) is None
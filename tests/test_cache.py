@@ -0,0 +1,35 @@
+import time
+
+from api.utlis.cache import TTLCache
+
+
+def test_ttl_cache_lru_eviction():
+    cache = TTLCache(maxsize=2, ttl=None)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # "b" is the least recently used
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_expiry_and_counters():
+    cache = TTLCache(maxsize=10, ttl=0.01)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 0)
+
+
+def test_ttl_cache_invalidation():
+    cache = TTLCache(maxsize=10, ttl=None)
+    for key in [("t1", 1), ("t1", 2), ("t2", 1)]:
+        cache.set(key, True)
+    assert cache.pop(("t2", 1)) is True
+    assert cache.discard_where(lambda k, v: k[0] == "t1") == 2
+    assert len(cache) == 0
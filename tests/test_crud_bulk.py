@@ -0,0 +1,43 @@
+import pytest
+from sqlmodel import select
+
+from api.models import Employee, EmployeeCreate, Tenant
+from api.services.cruds.tenant import employee_repo
+
+
+@pytest.mark.asyncio
+async def test_bulk_write_primitives(db):
+    tenant = Tenant(name="t", icon="i")
+    db.add(tenant)
+    await db.commit()
+
+    def employee(no):
+        return EmployeeCreate(employee_no=no, name=no, tenant_id=tenant.id)
+
+    created = await employee_repo.create_many(db, [employee("A"), employee("B")])
+    assert [e.employee_no for e in created] == ["A", "B"]
+    created = await employee_repo.create_many(
+        db, [employee("B"), employee("C")], ignore_conflicts=["employee_no"]
+    )
+    assert [e.employee_no for e in created] == ["C"]
+
+    ids = {e.employee_no: e.id for e in (await db.exec(select(Employee))).all()}
+    await employee_repo.update_many(
+        db, [{"id": ids["A"], "name": "a"}, {"id": ids["B"], "name": "b"}]
+    )
+    assert (
+        await employee_repo.update_where(
+            db, {"is_active": False}, Employee.employee_no.in_(["B", "C"])
+        )
+        == 2
+    )
+    rows = (await db.exec(select(Employee).order_by(Employee.employee_no))).all()
+    assert [(e.name, e.is_active) for e in rows] == [
+        ("a", True),
+        ("b", False),
+        ("C", False),
+    ]
+
+    assert await employee_repo.delete_where(db, Employee.is_active.is_(False)) == 2
+    assert await employee_repo.delete_many(db, [ids["A"]]) == 1
+    assert (await db.exec(select(Employee))).all() == []
@@ -0,0 +1,16 @@
+from datetime import date, datetime, timezone
+
+from api.utlis.dates import utc_range
+
+
+def test_utc_range_single_day():
+    start, end = utc_range(date(2025, 8, 15), tz="Asia/Kolkata")
+    assert start == datetime(2025, 8, 14, 18, 30, tzinfo=timezone.utc)
+    assert end == datetime(2025, 8, 15, 18, 30, tzinfo=timezone.utc)
+
+
+def test_utc_range_spans_dst_change():
+    # Europe/London moves to summer time on 2025-03-30
+    start, end = utc_range(date(2025, 3, 29), date(2025, 3, 30), tz="Europe/London")
+    assert start == datetime(2025, 3, 29, 0, 0, tzinfo=timezone.utc)
+    assert end == datetime(2025, 3, 30, 23, 0, tzinfo=timezone.utc)
@@ -0,0 +1,36 @@
+import pytest
+from sqlmodel import select
+
+from api.models import Employee, Tenant
+from api.sa.settings import settings
+from api.services.employee_service import employee_service
+
+
+@pytest.mark.asyncio
+async def test_import_reports_rows_without_aborting(monkeypatch, db):
+    monkeypatch.setattr(settings, "employee_import_chunk_rows", 2)
+    tenant = Tenant(name="t", icon="i")
+    db.add_all([tenant, Employee(employee_no="E0", name="old", tenant_id=tenant.id)])
+    await db.commit()
+
+    rows = [
+        {"employee_no": "E1", "name": "one"},
+        {"employee_no": "E0", "name": "stored"},
+        {"name": "no number"},
+        {"employee_no": "E1", "name": "again"},
+        {"employee_no": "E2", "name": "two", "email": "two@x"},
+        "junk",
+    ]
+    report = await employee_service.import_employees(tenant.id, rows, db)
+
+    assert (report["created"], report["duplicate"], report["invalid"]) == (2, 2, 2)
+    assert [r["status"] for r in report["rows"]] == [
+        "created",
+        "duplicate",
+        "invalid",
+        "duplicate",
+        "created",
+        "invalid",
+    ]
+    stored = (await db.exec(select(Employee.employee_no))).all()
+    assert sorted(stored) == ["E0", "E1", "E2"]
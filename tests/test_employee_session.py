@@ -0,0 +1,127 @@
+import pytest
+from sqlalchemy import event
+from sqlmodel import select
+
+from api.models import Employee, Tenant, Token
+from api.sa.settings import settings
+from api.sa.utils import token_digest
+from api.services.cruds.tenant import (
+    employee_repo,
+    employee_session_cache,
+    token_repo,
+)
+from api.services.employee_service import employee_service
+
+DEVICE = "d" * 64
+
+
+async def seed(db):
+    tenant = Tenant(name="t", icon="i")
+    employee = Employee(employee_no="E1", name="e", tenant_id=tenant.id)
+    db.add_all([tenant, employee])
+    await db.commit()
+    return tenant, employee
+
+
+def count_statements(engine) -> list:
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    return statements
+
+
+@pytest.mark.asyncio
+async def test_cached_session_skips_queries_until_invalidated(db_engine, db):
+    tenant, employee = await seed(db)
+    employee_session_cache.clear()
+    key = (tenant.id, employee.id, DEVICE)
+    refresh, access = await employee_service.get_tokens(
+        tenant.id, employee.id, DEVICE, db
+    )
+    statements = count_statements(db_engine)
+
+    async def session(access_jwt=access, refresh_jwt=refresh):
+        statements.clear()
+        return await employee_service.get_employee_session(
+            db, access_jwt, refresh_jwt, DEVICE
+        )
+
+    token, found, new_access = await session()
+    assert found.id == employee.id and new_access is None and statements
+    for _ in range(3):
+        token, found, _ = await session()
+        assert found.id == employee.id and statements == []
+
+    # deactivation drops the entry, the employee is looked up again
+    await employee_repo.deactivate(db, tenant.id, employee.id)
+    assert employee_session_cache.get(key) is None
+    token, found, _ = await session()
+    assert found is None and statements
+    await employee_repo.activate(db, tenant.id, employee.id)
+    await session()
+    await session()
+    assert statements == []
+
+    # rotation replaces the entry with the new access token
+    _, found, new_access = await session(access_jwt=None)
+    assert new_access and found.id == employee.id
+    assert employee_session_cache.get(key).token.token_hash == token_digest(new_access)
+    await session(access_jwt=new_access)
+    assert statements == []
+
+    # clearing the session drops the entry and the tokens
+    await employee_service.clear_session(tenant.id, employee.id, db)
+    assert employee_session_cache.get(key) is None
+    assert await session(access_jwt=new_access) is None and statements
+
+
+async def token_rows(db) -> list:
+    db.expire_all()
+    rows = (await db.exec(select(Token).order_by(Token.token_type))).all()
+    return [(t.token_type, t.token_hash) for t in rows]
+
+
+@pytest.mark.asyncio
+async def test_rotation_upserts_one_access_row(monkeypatch, db_engine, db):
+    monkeypatch.setattr(settings, "employee_token_upsert_rotation", True)
+    tenant, employee = await seed(db)
+    refresh, access = await employee_service.get_tokens(
+        tenant.id, employee.id, DEVICE, db
+    )
+    statements = count_statements(db_engine)
+
+    for _ in range(3):
+        statements.clear()
+        token, new_access = await employee_service.validate_employee_session(
+            db, None, refresh, DEVICE
+        )
+        # the refresh lookup and a single INSERT .. ON CONFLICT DO UPDATE
+        assert [s.split()[0] for s in statements] == ["SELECT", "INSERT"]
+        assert token.token_hash == token_digest(new_access)
+        assert await token_rows(db) == [
+            ("access_token_employee", token_digest(new_access)),
+            ("refresh_token_employee", token_digest(refresh)),
+        ]
+
+
+@pytest.mark.asyncio
+async def test_rotation_inserts_missing_access_row(monkeypatch, db):
+    monkeypatch.setattr(settings, "employee_token_upsert_rotation", True)
+    tenant, employee = await seed(db)
+    refresh, access = await employee_service.get_tokens(
+        tenant.id, employee.id, DEVICE, db
+    )
+    stored = await employee_service.get_access_token(tenant.id, employee.id, db)
+    await token_repo.delete(db, stored.id)
+
+    token, new_access = await employee_service.validate_employee_session(
+        db, None, refresh, DEVICE
+    )
+    assert token.id != stored.id
+    assert await token_rows(db) == [
+        ("access_token_employee", token_digest(new_access)),
+        ("refresh_token_employee", token_digest(refresh)),
+    ]
@@ -0,0 +1,40 @@
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+
+from api.utlis import export
+
+COLUMNS = ["timestamp", "status", "employee_id"]
+ID = uuid.uuid4()
+
+
+async def partitions():
+    yield [(datetime(2025, 8, 15, 9, 30), "IN", ID)]
+    yield [(datetime(2025, 8, 15, 18, 0), "OUT", ID), (None, "IN", ID)]
+
+
+async def collect(stream):
+    return [chunk async for chunk in stream]
+
+
+@pytest.mark.asyncio
+async def test_csv_stream_chunks():
+    chunks = await collect(export.csv_stream(COLUMNS, partitions()))
+    assert len(chunks) == 3
+    assert chunks[0] == "timestamp,status,employee_id\r\n"
+    assert chunks[1] == f"2025-08-15T09:30:00+00:00,IN,{ID}\r\n"
+    assert chunks[2].splitlines()[1] == f",IN,{ID}"
+
+
+@pytest.mark.asyncio
+async def test_ndjson_stream_chunks():
+    chunks = await collect(export.ndjson_stream(COLUMNS, partitions()))
+    rows = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert len(chunks) == 2
+    assert rows[1] == {
+        "timestamp": "2025-08-15T18:00:00+00:00",
+        "status": "OUT",
+        "employee_id": str(ID),
+    }
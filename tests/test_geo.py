@@ -0,0 +1,120 @@
+import random
+
+import pytest
+
+from api.utlis import geo
+
+
+def random_locations(n, seed=7):
+    rnd = random.Random(seed)
+    return [
+        {"lat": rnd.uniform(-80, 80), "lon": rnd.uniform(-180, 180)} for _ in range(n)
+    ]
+
+
+def test_geo_index_matches_find_nearest():
+    locations = random_locations(500)
+    index = geo.GeoIndex(locations)
+    for reference in random_locations(200, seed=11):
+        nearest, dist = geo.find_nearest(locations, reference)
+        assert index.nearest(reference["lat"], reference["lon"]) == (nearest, dist)
+
+
+def test_geo_index_max_distance():
+    locations = random_locations(50)
+    index = geo.GeoIndex(locations)
+    reference = {"lat": 10.0, "lon": 76.0}
+    nearest, dist = geo.find_nearest(locations, reference)
+
+    assert index.nearest(10.0, 76.0, max_distance=dist) == (nearest, dist)
+    assert index.nearest(10.0, 76.0, max_distance=dist * 0.99)[0] is None
+
+
+def test_geo_index_empty():
+    assert geo.GeoIndex([]).nearest(10.0, 76.0) == (None, float("inf"))
+
+
+needs_numpy = pytest.mark.skipif(geo.np is None, reason="numpy is not installed")
+
+
+def scalar_distances(df, reference, locations):
+    lat, lon = reference["lat"], reference["lon"]
+    return [df(lat, lon, loc["lat"], loc["lon"]) for loc in locations]
+
+
+@needs_numpy
+def test_batch_distances_equal_scalar():
+    locations = random_locations(300)
+    packed = geo.PackedCoordinates.pack(locations)
+    references = random_locations(20, seed=5)
+    for reference in references:
+        lat, lon = reference["lat"], reference["lon"]
+        # numpy and libm sin/cos may round the last bit differently
+        assert list(geo.haversine_distances(lat, lon, packed)) == pytest.approx(
+            scalar_distances(
+                geo.haversine_distance_between_points, reference, locations
+            ),
+            rel=1e-12,
+            abs=1e-9,
+        )
+        assert list(geo.cosine_distances(lat, lon, packed)) == pytest.approx(
+            scalar_distances(geo.cosine_distance_between_points, reference, locations),
+            rel=1e-12,
+            abs=1e-6,
+        )
+
+    # many reference points give one row each
+    lat = [ref["lat"] for ref in references]
+    lon = [ref["lon"] for ref in references]
+    matrix = geo.haversine_distances(lat, lon, packed)
+    assert matrix.shape == (len(references), len(locations))
+    assert (matrix[3] == geo.haversine_distances(lat[3], lon[3], packed)).all()
+
+
+@needs_numpy
+def test_batch_distance_to_the_same_point():
+    # the scalar acos can be handed 1 + 1 ulp here and raise ValueError, the
+    # batch one clips it; the law of cosines is only good to about 10 cm
+    locations = random_locations(100)
+    packed = geo.PackedCoordinates.pack(locations)
+    for i, loc in enumerate(locations):
+        assert geo.haversine_distances(loc["lat"], loc["lon"], packed)[i] < 1e-3
+
+
+@needs_numpy
+def test_batch_nearest():
+    locations = random_locations(300)
+    packed = geo.PackedCoordinates.pack(locations)
+    reference = {"lat": 10.0, "lon": 76.0}
+    nearest, dist = geo.find_nearest(locations, reference)
+
+    result = geo.batch_nearest(reference, packed, radius=dist * (1 + 1e-9))
+    assert locations[result.index] is nearest
+    assert result.distance == pytest.approx(dist, rel=1e-12)
+    assert result.within.sum() == 1 and result.within[result.index]
+
+    # one radius per coordinate
+    radius = [result.distances[i] + (1 if i % 2 else -1) for i in range(300)]
+    assert list(geo.batch_nearest(reference, packed, radius=radius).within) == [
+        i % 2 == 1 for i in range(300)
+    ]
+
+    empty = geo.batch_nearest(reference, geo.PackedCoordinates.pack([]))
+    assert empty.index == -1 and empty.distance == float("inf")
+    assert len(empty.within) == 0
+
+
+@needs_numpy
+def test_batch_nearest_many_matches_batch_nearest():
+    locations = random_locations(300)
+    packed = geo.PackedCoordinates.pack(locations)
+    references = random_locations(25, seed=3)
+    for df in (geo.haversine_distances, geo.cosine_distances):
+        many = geo.batch_nearest_many(references, packed, radius=2000, df=df)
+        for reference, result in zip(references, many):
+            one = geo.batch_nearest(reference, packed, radius=2000, df=df)
+            assert (result.index, result.distance) == (one.index, one.distance)
+            assert (result.within == one.within).all()
+
+    empty = geo.batch_nearest_many(references, geo.PackedCoordinates.pack([]))
+    assert [r.index for r in empty] == [-1] * len(references)
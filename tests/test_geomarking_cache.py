@@ -0,0 +1,39 @@
+import pytest
+
+from api.models import GeoMarkingCreate, Tenant
+from api.services.cruds.tenant import geomarking_repo
+
+
+def marking(tenant, name, lat):
+    return GeoMarkingCreate(tenant_id=tenant.id, name=name, latitude=lat, longitude=76)
+
+
+@pytest.mark.asyncio
+async def test_load_racing_a_write_does_not_cache_the_old_index(monkeypatch, db):
+    geomarking_repo.cache.clear()
+    tenant = Tenant(name="t", icon="i")
+    db.add(tenant)
+    await db.commit()
+    await geomarking_repo.create(db, marking(tenant, "gate", 10.0))
+
+    get_all = geomarking_repo._get_all
+
+    async def create_during_load(db, query):
+        # the markings are read, then a new one is created before the index
+        # built from them reaches the cache
+        markings = await get_all(db, query)
+        await geomarking_repo.create(db, marking(tenant, "annex", 11.0))
+        return markings
+
+    monkeypatch.setattr(geomarking_repo, "_get_all", create_during_load)
+    stale = await geomarking_repo.get_all_by_tenant(db, tenant.id)
+    assert [m.name for m in stale] == ["gate"]
+    assert len(geomarking_repo.cache) == 0
+
+    monkeypatch.setattr(geomarking_repo, "_get_all", get_all)
+    fresh = await geomarking_repo.get_all_by_tenant(db, tenant.id)
+    assert sorted(m.name for m in fresh) == ["annex", "gate"]
+    # with no write in between the load is cached
+    assert len(geomarking_repo.cache) == 1
+    nearest, _ = await geomarking_repo.find_nearest(db, tenant.id, 11.0, 76.0)
+    assert nearest.name == "annex"
@@ -0,0 +1,38 @@
+import pytest
+
+from api.sa import metrics
+
+
+class Route:
+    path_format = "/api/things/{id}"
+
+
+async def app(scope, receive, send):
+    scope["route"] = Route
+    metrics.record_statement(0.002)
+    metrics.record_statement(0.003)
+    await send({"type": "http.response.start", "status": 404})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def send(message):
+    pass
+
+
+@pytest.mark.asyncio
+async def test_middleware_records_route_latency_and_sql(monkeypatch):
+    monkeypatch.setattr(metrics, "routes", {})
+    middleware = metrics.MetricsMiddleware(app)
+    for _ in range(3):
+        await middleware({"type": "http", "method": "GET"}, None, send)
+    metrics.record_statement(1.0)  # outside of a request, not recorded
+
+    route = metrics.routes[("GET", "/api/things/{id}")]
+    assert route.count == 3 and route.statuses == {404: 3}
+    assert route.statements == 6 and route.sql == pytest.approx(0.015)
+
+    text = metrics.prometheus()
+    labels = 'method="GET",route="/api/things/{id}"'
+    assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in text
+    assert f'http_requests_total{{{labels},status="404"}} 3' in text
+    assert f"db_statements_total{{{labels}}} 6" in text
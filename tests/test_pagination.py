@@ -0,0 +1,69 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from api.models import Employee, Tenant
+from api.sa.settings import settings
+from api.services.cruds.base import (
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    page_limit,
+)
+from api.services.cruds.tenant import employee_repo
+
+
+def test_cursor_round_trip():
+    position = (datetime(2025, 8, 15, 9, 30, 0, 123456), uuid.uuid4())
+    assert decode_cursor(encode_cursor(*position)) == position
+
+
+@pytest.mark.parametrize(
+    "cursor", ["", "zzz", "W10", encode_cursor(datetime.now(), uuid.uuid4())[:-3]]
+)
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+
+def test_page_limit_is_capped():
+    assert page_limit() == settings.page_size_default
+    assert page_limit(10**6) == settings.page_size_max
+    assert page_limit(0) == settings.page_size_default
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit", [1, 3, 4, 6, 10])
+async def test_pages_in_stable_order_across_tied_created_at(db, limit):
+    tenant, other = Tenant(name="t", icon="i"), Tenant(name="o", icon="i")
+    start = datetime(2025, 8, 1, 9)
+    # created_at ties in pairs, another tenant's employees sort in between
+    staff = [
+        Employee(
+            employee_no=f"E{i}",
+            name="e",
+            tenant_id=tenant.id,
+            created_at=start + timedelta(seconds=i // 2),
+        )
+        for i in range(6)
+    ]
+    strangers = [
+        Employee(employee_no=f"X{i}", name="x", tenant_id=other.id, created_at=start)
+        for i in range(2)
+    ]
+    db.add_all([tenant, other, *staff, *strangers])
+    await db.commit()
+
+    pages, cursor = [], None
+    while True:
+        page = await employee_repo.get_page(db, tenant.id, cursor=cursor, limit=limit)
+        pages.append([e.id for e in page.items])
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    expected = [e.id for e in sorted(staff, key=lambda e: (e.created_at, e.id))]
+    assert [id for ids in pages for id in ids] == expected
+    assert all(ids for ids in pages)
+    assert len(pages) == -(-len(staff) // limit)
@@ -0,0 +1,32 @@
+import json
+import uuid
+from datetime import datetime
+from typing import List
+
+from fastapi import Response
+
+from api.models import Employee
+from api.schema.response import EmployeeStatus
+from api.utlis.response import ModelResponse
+
+
+def test_model_response_from_rows_keeps_sub_response_headers():
+    employee = Employee(employee_no="E1", name="e", tenant_id=uuid.uuid4())
+    employee.created_at = datetime(2025, 8, 1, 9, 30)
+    sub_response = Response()
+    sub_response.set_cookie("act_employee", "jwt")
+    sub_response.headers["X-Next-Cursor"] = "next"
+
+    response = ModelResponse(
+        List[EmployeeStatus],
+        [{**dict(employee), "last_marked_today": None, "device_locked": False}],
+        sub_response,
+    )
+
+    body = json.loads(response.body)
+    assert body[0]["employee_no"] == "E1"
+    assert body[0]["created_at"] == "2025-08-01T09:30:00"
+    assert body[0]["device_locked"] is False
+    assert response.headers["x-next-cursor"] == "next"
+    assert response.headers["content-length"] == str(len(response.body))
+    assert "act_employee=jwt" in response.headers["set-cookie"]
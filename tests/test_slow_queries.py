@@ -0,0 +1,26 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+
+from api.sa import slow_queries
+from api.services.cruds.tenant import user_repo
+
+
+@pytest.mark.asyncio
+async def test_slow_statement_logged_with_caller_and_plan(monkeypatch, db_engine, db):
+    monkeypatch.setattr(slow_queries, "entries", slow_queries.deque(maxlen=2))
+
+    @event.listens_for(db_engine.sync_engine, "after_cursor_execute")
+    def every_statement_is_slow(conn, cursor, statement, parameters, context, many):
+        slow_queries.observe(db_engine, statement, parameters, 1.5, many)
+
+    await user_repo.get_user_by_email(db, "admin@example.com")
+    while slow_queries._tasks:
+        await asyncio.sleep(0.01)
+
+    entry = slow_queries.recent()[0]
+    assert entry["ms"] == 1500
+    assert entry["caller"].endswith("userRepo.get_user_by_email")
+    assert entry["parameters"] == ["str"]
+    assert "admin@example.com" not in str(entry) and entry["plan"]
@@ -19,6 +19,17 @@ const api = axios.create({
 
 
 
+// list endpoints are paginated, follow X-Next-Cursor until the last page
+async function get_all_pages(url){
+    let res = await api.get(url)
+    const data = res.data
+    while (res.headers['x-next-cursor']) {
+        res = await api.get(url, { params: { cursor: res.headers['x-next-cursor'] } })
+        data.push(...res.data)
+    }
+    return { ...res, data }
+}
+
 export async function login(credentials){
 
     return api.post(
@@ -53,7 +64,7 @@ export async function get_me(){
 
 export async function get_employees(){
 
-    return api.get('/api/admin/tenant/employees/status')    
+    return get_all_pages('/api/admin/tenant/employees/status')
 }
 
 export async function create_employees(data){
@@ -83,7 +94,7 @@ export async function create_login_link(emp_id){
 
 export async function get_geomarking(){
 
-    return api.get('/api/admin/tenant/geomarking')    
+    return get_all_pages('/api/admin/tenant/geomarking')
 }
 
 export async function create_geomarking(data){